@@ -3,21 +3,25 @@ from __future__ import annotations
 from pathlib import Path
 from loguru import logger
 
+from sxm_mobility.assignment.soa import save_soa
 from sxm_mobility.config import settings
 from sxm_mobility.network.build_graph import build_graph
 from sxm_mobility.io.osm_ingest import (
-    save_gpickle,
+    graph_arrow_paths,
+    save_graph_arrow,
     save_graphml,
     export_nodes_edges_parquet,
 )
 
+
 def main() -> None:
     """Build graph artifacts and export tables for downstream use.
 
     Creates a `{data_dir}/processed` output directory, builds a graph for
     `settings.place_query` and `settings.network_type`, then writes:
 
-    - `graph.gpickle` (engine artifact)
+    - `graph.nodes.feather` and `graph.edges.feather` (engine artifact)
+    - `graph.soa.npz` (compact assignment arrays)
     - `graph.graphml` (shareable artifact)
     - `nodes.parquet` and `edges.parquet` (tabular exports)
 
@@ -30,11 +34,18 @@ def main() -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
 
     logger.info(f"Downloading + building graph for: {settings.place_query}")
-    G: "nx.MultiDiGraph" = build_graph(settings.place_query, settings.network_type)
+    G: "nx.MultiDiGraph" = build_graph(
+        settings.place_query, settings.network_type, cache_dir=settings.graph_cache_dir
+    )
+
+    graph_path: Path = out_dir / "graph"
+    save_graph_arrow(G, graph_path)
+    for p in graph_arrow_paths(graph_path):
+        logger.info(f"Saved: {p}")
 
-    gpickle_path: Path = out_dir / "graph.gpickle"
-    save_gpickle(G, gpickle_path)
-    logger.info(f"Saved: {gpickle_path}")
+    soa_path: Path = out_dir / "graph.soa.npz"
+    save_soa(G, soa_path)
+    logger.info(f"Saved: {soa_path}")
 
     graphml_path: Path = out_dir / "graph.graphml"
     save_graphml(G, graphml_path)
@@ -49,4 +60,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
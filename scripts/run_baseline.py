@@ -9,13 +9,18 @@ from sxm_mobility.assignment.metrics import top_bottlenecks, total_delay, total_
 from sxm_mobility.assignment.msa import msa_traffic_assignment
 from sxm_mobility.config import settings
 from sxm_mobility.demand.od_generation import random_od
-from sxm_mobility.io.osm_ingest import load_gpickle
+from sxm_mobility.io.osm_ingest import (
+    ID_DTYPES,
+    PARQUET_OPTIONS,
+    graph_arrow_paths,
+    load_graph_arrow,
+)
 
 
 def main() -> None:
     """Run baseline traffic assignment and export bottlenecks + KPI summary.
 
-    Loads a prebuilt graph from `{data_dir}/processed/graph.gpickle`, generates random
+    Loads a prebuilt graph from `{data_dir}/processed/graph.{nodes,edges}.feather`, generates random
     OD demand pairs, runs MSA traffic assignment, and exports:
 
     - `baseline_bottlenecks.parquet` and `baseline_bottlenecks.csv` (top bottleneck edges)
@@ -33,11 +38,14 @@ def main() -> None:
     :rtype: None
     """
     out_dir = Path(settings.data_dir) / "processed"
-    graph_path = out_dir / "graph.gpickle"
-    if not graph_path.exists():
-        raise FileNotFoundError(f"Graph not found: {graph_path}. Run scripts/build_graph.py first.")
+    graph_path = out_dir / "graph"
+    missing_paths = [p for p in graph_arrow_paths(graph_path) if not p.exists()]
+    if missing_paths:
+        raise FileNotFoundError(
+            f"Graph not found: {missing_paths[0]}. Run scripts/build_graph.py first."
+        )
 
-    G = load_gpickle(graph_path)
+    G = load_graph_arrow(graph_path)
 
     od = random_od(G, n_pairs=250)
     total_demand = sum(d for _, _, d in od)
@@ -45,28 +53,39 @@ def main() -> None:
 
     missing = sum(1 for o, d, _ in od if o not in G or d not in G)
     if missing:
-        raise ValueError(f"OD nodes missing from graph: {missing}/{len(od)} — OD generator is using wrong node IDs.")
+        raise ValueError(
+            f"OD nodes missing from graph: {missing}/{len(od)} — OD generator is using wrong node IDs."
+        )
 
     logger.info("Running assignment (iters={})", settings.msa_iters)
-    G = msa_traffic_assignment(G, od=od, iters=settings.msa_iters, alpha=settings.bpr_alpha, beta=settings.bpr_beta)
-
-    rows = top_bottlenecks(G, n=50)
-    df_b = pd.DataFrame(rows)
+    G = msa_traffic_assignment(
+        G,
+        od=od,
+        iters=settings.msa_iters,
+        alpha=settings.bpr_alpha,
+        beta=settings.bpr_beta,
+        rel_gap_tol=settings.msa_rel_gap_tol,
+        dtype=settings.msa_dtype,
+    )
+
+    df_b = top_bottlenecks(G, n=50, as_frame=True)
     out_b_parquet = out_dir / "baseline_bottlenecks.parquet"
     out_b_csv = out_dir / "baseline_bottlenecks.csv"
 
-    for c in ["u", "v", "key"]:
+    for c, dtype in ID_DTYPES.items():
         if c in df_b.columns:
-            df_b[c] = pd.to_numeric(df_b[c], errors="coerce").astype("Int64")
+            df_b[c] = pd.to_numeric(df_b[c], errors="coerce").astype(dtype)
 
-            df_b.to_parquet(out_b_parquet, index=False)
-            df_b.to_csv(out_b_csv, index=False)
-            logger.info("Saved bottlenecks to {}", out_b_parquet)
+    df_b.to_parquet(out_b_parquet, index=False, **PARQUET_OPTIONS)
+    df_b.to_csv(out_b_csv, index=False)
+    logger.info("Saved bottlenecks to {}", out_b_parquet)
 
     summary = {
         "place_query": settings.place_query,
         "network_type": settings.network_type,
         "msa_iters": settings.msa_iters,
+        "msa_rel_gap_tol": settings.msa_rel_gap_tol,
+        "msa_dtype": settings.msa_dtype,
         "bpr_alpha": settings.bpr_alpha,
         "bpr_beta": settings.bpr_beta,
         "od_pairs": len(od),
@@ -77,7 +96,7 @@ def main() -> None:
     }
     df_s = pd.DataFrame([summary])
     out_summary = out_dir / "results_baseline.parquet"
-    df_s.to_parquet(out_summary, index=False)
+    df_s.to_parquet(out_summary, index=False, **PARQUET_OPTIONS)
     logger.info("Saved baseline KPI summary to {}", out_summary)
 
 
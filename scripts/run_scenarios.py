@@ -7,11 +7,12 @@ import pandas as pd
 from loguru import logger
 
 from sxm_mobility.assignment.msa import msa_traffic_assignment
+from sxm_mobility.assignment.routing import build_routing_index
 from sxm_mobility.config import settings
 from sxm_mobility.demand.od_generation import random_od
-from sxm_mobility.io.osm_ingest import load_gpickle
+from sxm_mobility.io.osm_ingest import PARQUET_OPTIONS, graph_arrow_paths, load_graph_arrow
 from sxm_mobility.scenarios.catalog import AddConnector, Closure, IncreaseCapacity
-from sxm_mobility.scenarios.runner import run_scenario
+from sxm_mobility.scenarios.runner import run_scenarios
 
 
 def _as_json(x: object) -> str:
@@ -20,15 +21,21 @@ def _as_json(x: object) -> str:
 
 def main() -> None:
     out_dir = Path(settings.data_dir) / "processed"
-    graph_path = out_dir / "graph.gpickle"
-    if not graph_path.exists():
-        raise FileNotFoundError(f"Graph not found: {graph_path}. Run scripts/build_graph.py first.")
+    graph_path = out_dir / "graph"
+    missing_paths = [p for p in graph_arrow_paths(graph_path) if not p.exists()]
+    if missing_paths:
+        raise FileNotFoundError(
+            f"Graph not found: {missing_paths[0]}. Run scripts/build_graph.py first."
+        )
 
-    base_G = load_gpickle(graph_path)
+    base_G = load_graph_arrow(graph_path)
 
     # Synthetic OD for prototyping (replace with zone/real OD later)
     od = random_od(base_G, n_pairs=200)
 
+    # Topology-only shortest-path index, shared by the baseline and every overlay scenario
+    index = build_routing_index(base_G)
+
     # ---- Baseline (computed inside this script for scenario deltas)
     logger.info("Running baseline assignment (iters={})", settings.msa_iters)
     baseline_G = msa_traffic_assignment(
@@ -37,6 +44,9 @@ def main() -> None:
         iters=settings.msa_iters,
         alpha=settings.bpr_alpha,
         beta=settings.bpr_beta,
+        index=index,
+        rel_gap_tol=settings.msa_rel_gap_tol,
+        dtype=settings.msa_dtype,
     )
 
     from sxm_mobility.scenarios.evaluator import score_graph
@@ -54,8 +64,8 @@ def main() -> None:
             IncreaseCapacity(
                 name=f"Increase capacity {i+1}",
                 description="Prototype: increase capacity on a selected edge",
-                u=str(u),
-                v=str(v),
+                u=u,
+                v=v,
                 key=int(k),
                 pct=0.25,
             )
@@ -68,8 +78,8 @@ def main() -> None:
             Closure(
                 name="Closure test (first edge)",
                 description="Prototype: remove one edge to test fragility",
-                u=str(u),
-                v=str(v),
+                u=u,
+                v=v,
                 key=int(k),
             )
         )
@@ -77,8 +87,8 @@ def main() -> None:
     # 3) Add a connector between two random nodes (proxy for new link)
     nodes = list(base_G.nodes())
     if len(nodes) >= 2:
-        u = str(nodes[0])
-        v = str(nodes[-1])
+        u = nodes[0]
+        v = nodes[-1]
         scenarios.append(
             AddConnector(
                 name="Add connector (prototype)",
@@ -91,21 +101,25 @@ def main() -> None:
             )
         )
 
+    # Scenarios are independent MSA runs over a read-only base graph: fan them out.
     logger.info("Running {} scenarios", len(scenarios))
+    results = run_scenarios(
+        base_G,
+        od=od,
+        scenarios=scenarios,
+        iters=settings.msa_iters,
+        alpha=settings.bpr_alpha,
+        beta=settings.bpr_beta,
+        n_workers=settings.scenario_workers,
+        index=index,
+        rel_gap_tol=settings.msa_rel_gap_tol,
+        dtype=settings.msa_dtype,
+    )
 
     results_rows: list[dict] = []
     details_rows: list[dict] = []
 
-    for s in scenarios:
-        res = run_scenario(
-            base_graph=base_G,
-            od=od,
-            scenario=s,
-            iters=settings.msa_iters,
-            alpha=settings.bpr_alpha,
-            beta=settings.bpr_beta,
-        )
-
+    for s, res in zip(scenarios, results, strict=True):
         scores = res["scores"]
         scenario_dict = res["scenario"]
 
@@ -115,11 +129,14 @@ def main() -> None:
             "tstt": float(scores.get("tstt", 0.0)),
             "delay": float(scores.get("delay", 0.0)),
             "delta_tstt": float(scores.get("tstt", 0.0)) - float(baseline_scores.get("tstt", 0.0)),
-            "delta_delay": float(scores.get("delay", 0.0)) - float(baseline_scores.get("delay", 0.0)),
+            "delta_delay": float(scores.get("delay", 0.0))
+            - float(baseline_scores.get("delay", 0.0)),
             "baseline_tstt": float(baseline_scores.get("tstt", 0.0)),
             "baseline_delay": float(baseline_scores.get("delay", 0.0)),
             "od_pairs": len(od),
             "msa_iters": settings.msa_iters,
+            "msa_rel_gap_tol": settings.msa_rel_gap_tol,
+            "msa_dtype": settings.msa_dtype,
             "bpr_alpha": settings.bpr_alpha,
             "bpr_beta": settings.bpr_beta,
         }
@@ -134,7 +151,9 @@ def main() -> None:
                 "scenario_name": scenario_dict.get("name"),
                 "scenario_type": s.__class__.__name__,
                 "description": scenario_dict.get("description"),
-                "params_json": _as_json({k: v for k, v in scenario_dict.items() if k not in {"name", "description"}}),
+                "params_json": _as_json(
+                    {k: v for k, v in scenario_dict.items() if k not in {"name", "description"}}
+                ),
             }
         )
 
@@ -148,8 +167,8 @@ def main() -> None:
     out_results = out_dir / "results_scenarios.parquet"
     out_details = out_dir / "scenario_details.parquet"
 
-    df_results.to_parquet(out_results, index=False)
-    df_details.to_parquet(out_details, index=False)
+    df_results.to_parquet(out_results, index=False, **PARQUET_OPTIONS)
+    df_details.to_parquet(out_details, index=False, **PARQUET_OPTIONS)
 
     logger.info("Saved scenario summary results to {}", out_results)
     logger.info("Saved scenario details to {}", out_details)
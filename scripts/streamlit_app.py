@@ -1,15 +1,28 @@
 from __future__ import annotations
+
+import base64
+import io
 from pathlib import Path
+
+import numpy as np
 import pandas as pd
-import streamlit as st
 import plotly.graph_objects as go
-from shapely import wkt
+import shapely
+import streamlit as st
+
 from sxm_mobility.config import settings
+from sxm_mobility.io.osm_ingest import read_edges_extent
+
+try:
+    import datashader as ds
+    import datashader.transfer_functions as tf
+except ImportError:  # optional: large renders fall back to a Scattermapbox trace
+    ds = None
 
 st.set_page_config(page_title="SXM Mobility Graph Lab", layout="wide")
 
-APP_DIR = Path(__file__).resolve().parent          
-REPO_DIR = APP_DIR.parent                         
+APP_DIR = Path(__file__).resolve().parent
+REPO_DIR = APP_DIR.parent
 PROCESSED_DIR = REPO_DIR / "data" / "processed"
 
 EDGES_PATH = PROCESSED_DIR / "edges.parquet"
@@ -17,6 +30,31 @@ BOTTLENECKS_PATH = PROCESSED_DIR / "baseline_bottlenecks.parquet"
 KPI_PATH = PROCESSED_DIR / "results_baseline.parquet"
 SCEN_PATH = PROCESSED_DIR / "results_scenarios.parquet"
 
+# Above this many edges the network is rasterized server-side (needs datashader)
+RASTER_MIN_EDGES = 10_000
+
+
+@st.cache_data(show_spinner=False)
+def _load_parquet(path: str, mtime: float) -> pd.DataFrame:
+    """Read a parquet file once per `(path, mtime)`; reruns reuse the cached frame."""
+    return pd.read_parquet(path)
+
+
+def load_parquet(path: Path) -> pd.DataFrame:
+    """Load a processed artifact through the Streamlit data cache.
+
+    The file's modification time is part of the cache key, so rerunning the
+    pipeline scripts invalidates the cached frame automatically.
+
+    :param path: Parquet file to read.
+    :type path: Path
+    :raises FileNotFoundError: If the file does not exist.
+    :return: The parquet contents.
+    :rtype: pd.DataFrame
+    """
+    return _load_parquet(str(path), path.stat().st_mtime)
+
+
 st.title("SXM Mobility Graph Lab — Network Map (Plotly + OpenStreetMap)")
 st.caption("Prototype dashboard scaffold. Add maps + scenario runners here.")
 
@@ -42,11 +80,11 @@ st.write(
 
 st.subheader("Baseline outputs")
 try:
-    kpi = pd.read_parquet(KPI_PATH)
+    kpi = load_parquet(KPI_PATH)
     st.write("KPI summary")
     st.dataframe(kpi, use_container_width=True)
 
-    df = pd.read_parquet(BOTTLENECKS_PATH)
+    df = load_parquet(BOTTLENECKS_PATH)
     st.write("Top bottlenecks")
     st.dataframe(df, use_container_width=True)
 except FileNotFoundError:
@@ -57,7 +95,7 @@ except Exception as e:
 
 st.subheader("Scenario outputs")
 try:
-    scen = pd.read_parquet(SCEN_PATH)
+    scen = load_parquet(SCEN_PATH)
     st.dataframe(scen, use_container_width=True)
 except FileNotFoundError:
     st.info("Scenario outputs not found. Run scripts/run_scenarios.py to generate them.")
@@ -65,53 +103,104 @@ except Exception as e:
     st.warning(f"Scenario outputs error: {e}")
 
 
-def linestring_to_lonlat_lists(wkt_str: str) -> tuple[list[float], list[float]]:
-    """Parse a WKT LineString and return longitude/latitude coordinate lists.
+def _interleave_breaks(
+    coords: np.ndarray, index: np.ndarray, n_lines: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Scatter `(N, 2)` lon/lat vertices into one buffer with a NaN after each line.
 
-    Assumes the geometry is a LineString (or LineString-like) and that coordinates
-    are in (lon, lat) order, as commonly stored in OSM/Geo data.
-
-    :param wkt_str: WKT string representing a LineString geometry.
-    :type wkt_str: str
-    :raises Exception: If the WKT cannot be parsed or is not a LineString-like geometry.
-    :return: A tuple of (lons, lats) lists extracted from the geometry.
-    :rtype: tuple[list[float], list[float]]
+    :param coords: Vertex coordinates, grouped by line in order.
+    :type coords: np.ndarray
+    :param index: Line index of each vertex.
+    :type index: np.ndarray
+    :param n_lines: Number of lines (one NaN break is reserved per line).
+    :type n_lines: int
+    :return: A tuple of (lons, lats) float arrays.
+    :rtype: tuple[np.ndarray, np.ndarray]
     """
-    geom = wkt.loads(wkt_str)
-    xs, ys = geom.xy  # xs=lon, ys=lat
-    return list(xs), list(ys)
+    out = np.full((len(coords) + n_lines, 2), np.nan)
+    # vertex j of line i lands after the i breaks that precede it
+    out[np.arange(len(coords)) + index] = coords
+    return out[:, 0], out[:, 1]
 
 
-def build_network_trace(edges_df: pd.DataFrame, max_edges: int | None = None) -> "go.Scattermapbox":
-    """Build a single Plotly Mapbox trace representing many network edges.
+def lonlat_lists_with_breaks(lons: np.ndarray, lats: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Flatten packed per-edge `lons`/`lats` arrays (see `edges.parquet`) with NaN breaks.
 
-    Efficiently draws many line segments by concatenating all coordinates into one
-    `Scattermapbox` trace, using `None` separators between segments (Plotly treats
-    `None` as a line break).
+    :param lons: Object array holding one longitude array per edge.
+    :type lons: np.ndarray
+    :param lats: Object array holding one latitude array per edge.
+    :type lats: np.ndarray
+    :return: A tuple of (lons, lats) float arrays.
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    if len(lons) == 0:
+        return np.empty(0), np.empty(0)
+    lengths = np.fromiter(map(len, lons), dtype=np.intp, count=len(lons))
+    coords = np.column_stack([np.concatenate(lons), np.concatenate(lats)])
+    index = np.repeat(np.arange(len(lengths)), lengths)
+    return _interleave_breaks(coords, index, len(lengths))
 
-    Expects `edges_df` to contain a `geometry_wkt` column with WKT LineString values.
 
-    :param edges_df: Edge table containing a `geometry_wkt` column.
+def edge_coords(edges_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten every edge's coordinates once into NaN-separated lon/lat buffers.
+
+    Uses the packed `lons`/`lats` columns when present and falls back to parsing
+    the `geometry_wkt` column (edges exported before those columns existed).
+    Edges without geometry take no space in the buffers.
+
+    :param edges_df: Edge table containing `lons`/`lats` or a `geometry_wkt` column.
     :type edges_df: pd.DataFrame
-    :param max_edges: Optional cap on the number of edges to render (uses `.head()`),
-        defaults to None.
+    :raises KeyError: If neither coordinate representation is present.
+    :return: `(lons, lats, ends)` where `ends[i]` is the buffer length covering
+        edges `0..i` (including their breaks), so the first `n` edges are
+        `lons[:ends[n - 1]]`.
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    lengths = np.zeros(len(edges_df), dtype=np.intp)
+    if "lons" in edges_df.columns:
+        present = (edges_df["lons"].notna() & edges_df["lats"].notna()).to_numpy()
+        packed_lons = edges_df["lons"].to_numpy()[present]
+        lengths[present] = np.fromiter(map(len, packed_lons), dtype=np.intp, count=len(packed_lons))
+        lons, lats = lonlat_lists_with_breaks(packed_lons, edges_df["lats"].to_numpy()[present])
+    else:
+        present = edges_df["geometry_wkt"].notna().to_numpy()
+        geoms = shapely.from_wkt(edges_df["geometry_wkt"].to_numpy()[present])
+        lengths[present] = shapely.get_num_coordinates(geoms)
+        coords, index = shapely.get_coordinates(geoms, return_index=True)
+        lons, lats = _interleave_breaks(coords, index, len(geoms))
+    ends = np.cumsum(np.where(present, lengths + 1, 0))
+    return lons, lats, ends
+
+
+def build_network_trace(
+    lons: np.ndarray, lats: np.ndarray, ends: np.ndarray, max_edges: int | None = None
+) -> go.Scattermapbox:
+    """Build a single Plotly Mapbox trace representing many network edges.
+
+    Efficiently draws many line segments by concatenating all coordinates into one
+    `Scattermapbox` trace, using NaN separators between segments (Plotly treats
+    them as line breaks). The buffers come from :func:`edge_coords`; capping the
+    edge count is a slice, so slider changes never re-parse geometry.
+
+    :param lons: Flat longitude buffer from :func:`edge_coords`.
+    :type lons: np.ndarray
+    :param lats: Flat latitude buffer from :func:`edge_coords`.
+    :type lats: np.ndarray
+    :param ends: Per-edge end offsets from :func:`edge_coords`.
+    :type ends: np.ndarray
+    :param max_edges: Optional cap on the number of edges to render (the first
+        `max_edges` rows), defaults to None.
     :type max_edges: int | None, optional
-    :raises KeyError: If `geometry_wkt` column is missing.
     :return: A Plotly Scattermapbox trace suitable for adding to a Figure.
     :rtype: go.Scattermapbox
     """
-    if max_edges is not None:
-        edges_df = edges_df.head(max_edges)
-
-    lons_all, lats_all = [], []
-    for w in edges_df["geometry_wkt"].dropna():
-        lons, lats = linestring_to_lonlat_lists(w)
-        lons_all.extend(lons + [None])
-        lats_all.extend(lats + [None])
+    if max_edges is not None and len(ends):
+        end = ends[min(max_edges, len(ends)) - 1] if max_edges > 0 else 0
+        lons, lats = lons[:end], lats[:end]
 
     return go.Scattermapbox(
-        lon=lons_all,
-        lat=lats_all,
+        lon=lons,
+        lat=lats,
         mode="lines",
         line=dict(width=2),
         hoverinfo="skip",
@@ -119,11 +208,49 @@ def build_network_trace(edges_df: pd.DataFrame, max_edges: int | None = None) ->
     )
 
 
+def raster_network_layer(
+    lons: np.ndarray, lats: np.ndarray, width: int = 1200, height: int = 800
+) -> dict:
+    """Rasterize NaN-separated edge lines into a single PNG mapbox image layer.
+
+    Lines are drawn with datashader in Web Mercator so the image lines up with
+    the basemap when stretched between its corner coordinates; the browser then
+    receives one image instead of every vertex.
+
+    :param lons: Flat longitude buffer from :func:`edge_coords`.
+    :type lons: np.ndarray
+    :param lats: Flat latitude buffer from :func:`edge_coords`.
+    :type lats: np.ndarray
+    :param width: Raster width in pixels, defaults to 1200.
+    :type width: int, optional
+    :param height: Raster height in pixels, defaults to 800.
+    :type height: int, optional
+    :return: A `layout.mapbox.layers` entry.
+    :rtype: dict
+    """
+    ys = np.log(np.tan(np.pi / 4 + np.radians(lats) / 2))
+    x0, x1 = float(np.nanmin(lons)), float(np.nanmax(lons))
+    y0, y1 = float(np.nanmin(ys)), float(np.nanmax(ys))
+    cvs = ds.Canvas(plot_width=width, plot_height=height, x_range=(x0, x1), y_range=(y0, y1))
+    agg = cvs.line(pd.DataFrame({"x": lons, "y": ys}), "x", "y", agg=ds.count())
+    img = tf.shade(agg, cmap=["#636efa", "#636efa"], how="linear").to_pil()
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    lat0, lat1 = (float(v) for v in np.degrees(2 * np.arctan(np.exp([y0, y1])) - np.pi / 2))
+    return dict(
+        sourcetype="image",
+        source="data:image/png;base64," + base64.b64encode(buf.getvalue()).decode(),
+        coordinates=[[x0, lat1], [x1, lat1], [x1, lat0], [x0, lat0]],
+        below="traces",
+    )
+
+
 def compute_center(edges_df: pd.DataFrame) -> tuple[float, float]:
     """Compute an approximate map center (lat, lon) from edge geometries.
 
     Uses a small sample of up to the first 200 non-null `geometry_wkt` rows, parses
-    each geometry, and averages all coordinates to estimate the center.
+    them in one vectorized call, and averages all coordinates to estimate the center.
 
     If no coordinates are available, falls back to a hard-coded center
     (approximately Sint Maarten).
@@ -135,19 +262,43 @@ def compute_center(edges_df: pd.DataFrame) -> tuple[float, float]:
     :rtype: tuple[float, float]
     """
     # quick-and-good center: take first N geometries and average coords
-    sample = edges_df["geometry_wkt"].dropna().head(200)
-    lons_sum, lats_sum, n = 0.0, 0.0, 0
-    for w in sample:
-        xs, ys = linestring_to_lonlat_lists(w)
-        lons_sum += sum(xs)
-        lats_sum += sum(ys)
-        n += len(xs)
-    if n == 0:
+    sample = edges_df["geometry_wkt"].dropna().head(200).to_numpy()
+    coords = shapely.get_coordinates(shapely.from_wkt(sample))
+    if len(coords) == 0:
         return 18.0, -63.1  # fallback (SXM-ish)
-    return (lats_sum / n), (lons_sum / n)
+    lon, lat = coords.mean(axis=0)
+    return float(lat), float(lon)
+
+
+@st.cache_data(show_spinner=False)
+def _edges_center(path: str, mtime: float) -> tuple[float, float]:
+    """Map center for an edges file, keyed like `_load_parquet`.
+
+    Reads the center stored in the parquet metadata at export time; files
+    exported before that fall back to :func:`compute_center`.
+    """
+    extent = read_edges_extent(path)
+    if extent is not None:
+        return extent["center_lat"], extent["center_lon"]
+    return compute_center(_load_parquet(path, mtime))
+
+
+@st.cache_data(show_spinner=False)
+def _edge_coords(path: str, mtime: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Memoized :func:`edge_coords` for an edges file, keyed like `_load_parquet`."""
+    return edge_coords(_load_parquet(path, mtime))
+
+
+@st.cache_data(show_spinner=False)
+def _raster_network_layer(path: str, mtime: float, max_edges: int) -> dict:
+    """Memoized :func:`raster_network_layer` of the first `max_edges` edges, keyed like `_load_parquet`."""
+    lons, lats, ends = _edge_coords(path, mtime)
+    end = ends[min(max_edges, len(ends)) - 1]
+    return raster_network_layer(lons[:end], lats[:end])
+
 
 st.subheader("St. Maarten Road Network Map")
-st.sidebar.header("Render options") 
+st.sidebar.header("Render options")
 max_edges = st.sidebar.slider("Max edges to draw (performance)", 500, 20000, 8000, step=500)
 
 if not EDGES_PATH.exists():
@@ -158,19 +309,26 @@ if not EDGES_PATH.exists():
     )
     st.stop()
 
-edges = pd.read_parquet(EDGES_PATH)
-base_trace = build_network_trace(edges, max_edges=max_edges)
-center_lat, center_lon = compute_center(edges)
+edges_mtime = EDGES_PATH.stat().st_mtime
+edges = _load_parquet(str(EDGES_PATH), edges_mtime)
+edge_lons, edge_lats, edge_ends = _edge_coords(str(EDGES_PATH), edges_mtime)
+center_lat, center_lon = _edges_center(str(EDGES_PATH), edges_mtime)
 
 fig = go.Figure()
-fig.add_trace(base_trace)
+network_layers = []
+if ds is not None and min(max_edges, len(edge_ends)) >= RASTER_MIN_EDGES:
+    network_layers.append(_raster_network_layer(str(EDGES_PATH), edges_mtime, max_edges))
+    # the image layer alone creates no mapbox subplot: keep an (empty) trace on the map
+    fig.add_trace(build_network_trace(edge_lons, edge_lats, edge_ends, max_edges=0))
+else:
+    fig.add_trace(build_network_trace(edge_lons, edge_lats, edge_ends, max_edges=max_edges))
 
 show_bottlenecks = st.sidebar.checkbox("Overlay bottlenecks (if available)", value=True)
 top_n = st.sidebar.slider("Top N bottlenecks", 10, 300, 50, step=10)
 
 if show_bottlenecks:
     try:
-        b = pd.read_parquet(BOTTLENECKS_PATH)
+        b = load_parquet(BOTTLENECKS_PATH)
         merged = b.merge(edges, on=["u", "v", "key"], how="left")
         metric_col = "delay" if "delay" in merged.columns else None
         merged = merged.dropna(subset=["geometry_wkt"])
@@ -179,11 +337,8 @@ if show_bottlenecks:
 
         merged = merged.head(top_n)
 
-        lons_all, lats_all = [], []
-        for w in merged["geometry_wkt"]:
-            lons, lats = linestring_to_lonlat_lists(w)
-            lons_all.extend(lons + [None])
-            lats_all.extend(lats + [None])
+        # one NaN-separated float buffer, filled in a single vectorized pass
+        lons_all, lats_all, _ = edge_coords(merged)
 
         fig.add_trace(
             go.Scattermapbox(
@@ -206,6 +361,7 @@ fig.update_layout(
         style="open-street-map",
         center=dict(lat=center_lat, lon=center_lon),
         zoom=12,
+        layers=network_layers,
     ),
     margin=dict(l=0, r=0, t=0, b=0),
     height=750,
@@ -0,0 +1,338 @@
+"""Numeric kernels for the assignment loop, JIT-compiled with numba when it is installed."""
+
+from __future__ import annotations
+
+import heapq
+
+import numpy as np
+
+from sxm_mobility.assignment.bpr import bpr_times
+
+try:
+    from numba import get_num_threads, njit, prange
+except ImportError:  # pragma: no cover - exercised without the `fast` extra
+    njit = None
+
+#: Whether the compiled kernels (and :func:`msa_core`) are available.
+HAVE_NUMBA = njit is not None
+
+
+def _accumulate_flows_numpy(
+    offsets: np.ndarray, edge_ids: np.ndarray, demands: np.ndarray, n_edges: int
+) -> np.ndarray:
+    weights = np.repeat(demands, np.diff(offsets))
+    return np.bincount(edge_ids, weights=weights, minlength=n_edges).astype(np.float64)
+
+
+if njit is not None:
+
+    @njit(nogil=True, inline="always", cache=True)
+    def _bpr_time_numba(t0, flow, capacity, alpha, beta):  # pragma: no cover - compiled
+        # compiled scalar :func:`~sxm_mobility.assignment.bpr.bpr_time`, shared by the kernels below
+        x = max(flow / capacity, 0.0) if capacity > 0 else 0.0
+        if beta == 4.0:
+            x *= x
+            return t0 * (1.0 + alpha * x * x)
+        return t0 * (1.0 + alpha * x**beta)
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _bpr_update_numba(t0, capacity, flow, time, alpha, beta):  # pragma: no cover - compiled
+        for i in prange(t0.shape[0]):
+            time[i] = _bpr_time_numba(t0[i], flow[i], capacity[i], alpha, beta)
+
+    @njit(parallel=True, cache=True)
+    def _accumulate_flows_numba(  # pragma: no cover - compiled
+        offsets, edge_ids, demands, n_edges, n_chunks
+    ):
+        n_paths = demands.shape[0]
+        # one private flow vector per chunk of paths, so threads never write the same slot
+        local = np.zeros((n_chunks, n_edges))
+        for c in prange(n_chunks):
+            for i in range(c * n_paths // n_chunks, (c + 1) * n_paths // n_chunks):
+                demand = demands[i]
+                for j in range(offsets[i], offsets[i + 1]):
+                    local[c, edge_ids[j]] += demand
+        return local.sum(axis=0)
+
+
+def accumulate_flows(
+    offsets: np.ndarray, edge_ids: np.ndarray, demands: np.ndarray, n_edges: int
+) -> np.ndarray:
+    """Sum path demands onto edges.
+
+    Paths are stored CSR-style: path `i` covers `edge_ids[offsets[i]:offsets[i + 1]]`
+    and carries `demands[i]`.
+
+    :return: Flow per edge id, shape `(n_edges,)`.
+    :rtype: np.ndarray
+    """
+    if njit is None:
+        return _accumulate_flows_numpy(offsets, edge_ids, demands, n_edges)
+    n_chunks = max(1, min(get_num_threads(), len(demands)))
+    return _accumulate_flows_numba(offsets, edge_ids, demands, n_edges, n_chunks)
+
+
+def bpr_update(
+    t0: np.ndarray,
+    capacity: np.ndarray,
+    flow: np.ndarray,
+    time: np.ndarray,
+    alpha: float,
+    beta: float,
+) -> None:
+    """Write BPR travel times for every edge into `time` (see :func:`bpr_times`)."""
+    if njit is None:
+        bpr_times(t0, flow, capacity, alpha=alpha, beta=beta, out=time)
+    else:
+        _bpr_update_numba(t0, capacity, flow, time, float(alpha), float(beta))
+
+
+if njit is not None:
+
+    @njit(nogil=True, cache=True)
+    def _assign_origins_numba(  # pragma: no cover - compiled
+        g_start,
+        g_end,
+        weights,
+        best,
+        arc_tail,
+        indptr,
+        heads,
+        csr_arc,
+        origins,
+        dest_offsets,
+        dests,
+        demands,
+        dist,
+        pred,
+        is_target,
+        aux,
+    ):
+        # all-or-nothing flows of origin groups [g_start, g_end) added into `aux`;
+        # `dist`, `pred` and `is_target` are this caller's scratch. Returns the
+        # number of unreachable pairs.
+        unreachable = 0
+        for g in range(g_start, g_end):
+            src = origins[g]
+            remaining = 0
+            for i in range(dest_offsets[g], dest_offsets[g + 1]):
+                if not is_target[dests[i]]:
+                    is_target[dests[i]] = True
+                    remaining += 1
+
+            dist[:] = np.inf
+            pred[:] = -1
+            dist[src] = 0.0
+            heap = [(0.0, src)]
+            while len(heap) > 0:
+                du, u = heapq.heappop(heap)
+                if du > dist[u]:
+                    continue
+                if is_target[u]:
+                    is_target[u] = False
+                    remaining -= 1
+                    if remaining == 0:
+                        break
+                for j in range(indptr[u], indptr[u + 1]):
+                    a = csr_arc[j]
+                    dv = du + weights[a]
+                    v = heads[j]
+                    if dv < dist[v]:
+                        dist[v] = dv
+                        pred[v] = a
+                        heapq.heappush(heap, (dv, v))
+
+            for i in range(dest_offsets[g], dest_offsets[g + 1]):
+                is_target[dests[i]] = False
+                node = dests[i]
+                while node != src and pred[node] >= 0:
+                    node = arc_tail[pred[node]]
+                if node != src:
+                    unreachable += 1
+                    continue
+                node = dests[i]
+                while node != src:
+                    aux[best[pred[node]]] += demands[i]
+                    node = arc_tail[pred[node]]
+        return unreachable
+
+    @njit(nogil=True, parallel=True, cache=True)
+    def _msa_core_numba(  # pragma: no cover - compiled
+        t0,
+        capacity,
+        flow,
+        time,
+        arc_edge_ids,
+        arc_tail,
+        indptr,
+        heads,
+        csr_arc,
+        origins,
+        dest_offsets,
+        dests,
+        demands,
+        iters,
+        alpha,
+        beta,
+        tol,
+        step_up,
+        step_down,
+        n_chunks,
+    ):
+        n_arcs, width = arc_edge_ids.shape
+        n_nodes = indptr.shape[0] - 1
+        n_origins = origins.shape[0]
+        weights = np.empty(n_arcs, dtype=time.dtype)
+        best = np.empty(n_arcs, dtype=arc_edge_ids.dtype)
+        # flows are always accumulated in float64, whatever the dtype of the edge arrays
+        aux = np.empty(t0.shape[0])
+        # one Dijkstra scratch set and private flow vector per chunk of origins,
+        # so threads never write the same slot
+        aux_local = np.empty((n_chunks, t0.shape[0]))
+        dist = np.empty((n_chunks, n_nodes))
+        pred = np.empty((n_chunks, n_nodes), dtype=csr_arc.dtype)
+        is_target = np.zeros((n_chunks, n_nodes), dtype=np.bool_)
+        unreachable = np.zeros(n_chunks, dtype=np.int64)
+
+        k = 0
+        failed = 0
+        rg = np.inf
+        inv_step = 0.0
+        residual_prev = np.inf
+        while True:
+            for i in range(t0.shape[0]):
+                time[i] = _bpr_time_numba(t0[i], flow[i], capacity[i], alpha, beta)
+            if k == iters or rg < tol:
+                break
+
+            # arc weight = fastest open parallel edge
+            for a in range(n_arcs):
+                w = np.inf
+                b = -1
+                for j in range(width):
+                    e = arc_edge_ids[a, j]
+                    if e >= 0 and time[e] < w:
+                        w = time[e]
+                        b = e
+                weights[a] = w
+                best[a] = b
+
+            for c in prange(n_chunks):
+                aux_local[c, :] = 0.0
+                unreachable[c] = _assign_origins_numba(
+                    c * n_origins // n_chunks,
+                    (c + 1) * n_origins // n_chunks,
+                    weights,
+                    best,
+                    arc_tail,
+                    indptr,
+                    heads,
+                    csr_arc,
+                    origins,
+                    dest_offsets,
+                    dests,
+                    demands,
+                    dist[c],
+                    pred[c],
+                    is_target[c],
+                    aux_local[c],
+                )
+            for i in range(aux.shape[0]):
+                total = 0.0
+                for c in range(n_chunks):
+                    total += aux_local[c, i]
+                aux[i] = total
+
+            residual = 0.0
+            for i in range(flow.shape[0]):
+                residual += (aux[i] - flow[i]) ** 2
+            if k == 0:
+                inv_step = 1.0
+            elif residual >= residual_prev:
+                inv_step += step_up
+            else:
+                inv_step += step_down
+            residual_prev = residual
+            step = 1.0 / inv_step
+
+            change = 0.0
+            norm = 0.0
+            for i in range(flow.shape[0]):
+                delta = step * (aux[i] - flow[i])
+                flow[i] += delta
+                change += delta * delta
+                norm += flow[i] * flow[i]
+            rg = np.sqrt(change) / max(np.sqrt(norm), 1e-12)
+            k += 1
+            if k == 1:
+                failed = unreachable.sum()
+        return k, rg, failed
+
+
+def msa_core(
+    t0: np.ndarray,
+    capacity: np.ndarray,
+    flow: np.ndarray,
+    time: np.ndarray,
+    arc_edge_ids: np.ndarray,
+    csr: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    od: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    iters: int,
+    alpha: float,
+    beta: float,
+    tol: float = 0.0,
+    step_growth: tuple[float, float] = (1.0, 1.0),
+) -> tuple[int, float, int]:
+    """The whole MSA loop as one compiled call, updating `flow` and `time` in place.
+
+    Each iteration refreshes BPR times, re-weights the arcs, runs one heap
+    Dijkstra per origin (stopping once its destinations are settled) and averages
+    the all-or-nothing flows in; `time` is refreshed once more at the end. Runs
+    without the GIL, so several assignments can share one process.
+
+    Origins are split into one chunk per numba thread (`NUMBA_NUM_THREADS`), each
+    searching and walking its paths into a private flow vector that is summed
+    afterwards.
+
+    The step is `1/b_k` with `b_0 = 1` and `b_k = b_(k-1) + up` when the residual
+    `|y_k - x_k|` did not shrink, `+ down` otherwise, for `step_growth=(up, down)`;
+    the default `(1, 1)` is the classic `1/(k+1)`. The loop stops early once the
+    relative flow change `|x_k - x_(k-1)| / |x_k|` drops below `tol` (never with
+    the default 0).
+
+    :param csr: `(indptr, heads, arc ids, arc tails)` from :meth:`RoutingIndex.csr`.
+    :param od: `(origins, dest offsets, dests, demands)`: node ids grouped by origin,
+        destinations of `origins[g]` at `dests[offsets[g]:offsets[g + 1]]`.
+    :raises RuntimeError: If numba is not installed (check :data:`HAVE_NUMBA`).
+    :return: Iterations run, the last relative flow change and the number of
+        `od` pairs with no path in the first iteration.
+    :rtype: tuple[int, float, int]
+    """
+    if njit is None:
+        raise RuntimeError("msa_core needs numba: `uv sync --extra fast`")
+    indptr, heads, csr_arc, arc_tail = csr
+    origins, dest_offsets, dests, demands = od
+    n_chunks = max(1, min(get_num_threads(), len(origins)))
+    k, rg, failed = _msa_core_numba(
+        t0,
+        capacity,
+        flow,
+        time,
+        arc_edge_ids,
+        arc_tail,
+        indptr,
+        heads,
+        csr_arc,
+        origins,
+        dest_offsets,
+        dests,
+        demands,
+        int(iters),
+        float(alpha),
+        float(beta),
+        float(tol),
+        float(step_growth[0]),
+        float(step_growth[1]),
+        n_chunks,
+    )
+    return int(k), float(rg), int(failed)
@@ -1,9 +1,44 @@
 from __future__ import annotations
 
+import numpy as np
 
-def bpr_time(t0: float, flow: float, capacity: float, alpha: float = 0.15, beta: float = 4.0) -> float:
+
+def bpr_time(
+    t0: float, flow: float, capacity: float, alpha: float = 0.15, beta: float = 4.0
+) -> float:
     """Bureau of Public Roads (BPR) travel time function."""
     if capacity <= 0:
         return float(t0)
     x = max(0.0, flow / capacity)
     return float(t0) * (1.0 + alpha * (x**beta))
+
+
+def bpr_times(
+    t0: np.ndarray,
+    flow: np.ndarray,
+    capacity: np.ndarray,
+    alpha: float = 0.15,
+    beta: float = 4.0,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Vectorized :func:`bpr_time` over aligned per-edge arrays.
+
+    Every step runs in place on `out` (allocated when omitted), so a caller
+    passing its own buffer gets no per-call temporaries beyond a capacity mask.
+    """
+    if out is None:
+        out = np.empty(np.shape(t0), dtype=np.float64)
+    open_ = capacity > 0
+    np.divide(flow, capacity, out=out, where=open_)
+    out[~open_] = 0.0  # x = 0 -> free-flow time
+    np.maximum(out, 0.0, out=out)
+    if beta == 4.0:
+        # the usual BPR exponent: two squarings instead of a general pow
+        np.square(out, out=out)
+        np.square(out, out=out)
+    else:
+        np.power(out, beta, out=out)
+    out *= alpha
+    out += 1.0
+    out *= t0
+    return out
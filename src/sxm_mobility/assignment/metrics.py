@@ -1,9 +1,35 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any
+
 import networkx as nx
+import numpy as np
+import pandas as pd
+
+from sxm_mobility.assignment.soa import EdgeArrays, EdgeState
+
+BOTTLENECK_COLUMNS = ["u", "v", "key", "flow", "capacity", "v_c", "delay"]
+
+
+def _iter_edges(
+    G: nx.MultiDiGraph | EdgeState,
+) -> Iterator[tuple[Any, Any, int, Mapping[str, Any]]]:
+    """Yield `(u, v, key, data)` from a graph or from an MSA edge-state mapping."""
+    if isinstance(G, nx.Graph):
+        yield from G.edges(keys=True, data=True)
+    else:
+        for (u, v, k), data in G.items():
+            yield u, v, k, data
 
 
-def total_system_travel_time(G: nx.MultiDiGraph) -> float:
+def _column(G: nx.MultiDiGraph | EdgeState, get: Callable[[Mapping[str, Any]], Any]) -> np.ndarray:
+    """One float64 value per edge, read with `get(data)` in a single pass."""
+    n = G.number_of_edges() if isinstance(G, nx.Graph) else len(G)
+    return np.fromiter((float(get(d)) for *_, d in _iter_edges(G)), dtype=np.float64, count=n)
+
+
+def total_system_travel_time(G: nx.MultiDiGraph | EdgeState | EdgeArrays) -> float:
     """Compute total system travel time (TSTT) over all edges.
 
     TSTT is computed as the sum over edges of:
@@ -11,20 +37,23 @@ def total_system_travel_time(G: nx.MultiDiGraph) -> float:
 
     Missing attributes default to 0.0.
 
-    :param G: Directed multigraph whose edges contain `flow` and `time` attributes.
-    :type G: nx.MultiDiGraph
+    :param G: Directed multigraph whose edges contain `flow` and `time` attributes,
+        or the edge state / arrays returned by `msa_edge_state` / `msa_edge_arrays`.
+    :type G: nx.MultiDiGraph | EdgeState | EdgeArrays
     :return: Total system travel time (sum of flow * time).
     :rtype: float
     """
-    return float(
-        sum(
-            float(d.get("flow", 0.0)) * float(d.get("time", 0.0))
-            for *_, d in G.edges(data=True, keys=True)
+    if isinstance(G, EdgeArrays):
+        # float64 accumulation also for float32 assignment arrays
+        return float(
+            np.dot(G.flow.astype(np.float64, copy=False), G.time.astype(np.float64, copy=False))
         )
-    )
+    flow = _column(G, lambda d: d.get("flow", 0.0))
+    time = _column(G, lambda d: d.get("time", 0.0))
+    return float(np.dot(flow, time))
 
 
-def total_delay(G: nx.MultiDiGraph) -> float:
+def total_delay(G: nx.MultiDiGraph | EdgeState | EdgeArrays) -> float:
     """Compute total delay over all edges relative to free-flow time.
 
     Total delay is computed as the sum over edges of:
@@ -37,57 +66,136 @@ def total_delay(G: nx.MultiDiGraph) -> float:
 
     Missing `flow` defaults to 0.0.
 
-    :param G: Directed multigraph whose edges contain `flow`, `time`, and optionally `t0`.
-    :type G: nx.MultiDiGraph
+    :param G: Directed multigraph whose edges contain `flow`, `time`, and optionally `t0`,
+        or the edge state / arrays returned by `msa_edge_state` / `msa_edge_arrays`.
+    :type G: nx.MultiDiGraph | EdgeState | EdgeArrays
     :return: Total delay (flow-weighted excess time over free-flow).
     :rtype: float
     """
-    return float(
-        sum(
-            float(d.get("flow", 0.0))
-            * (float(d.get("time", 0.0)) - float(d.get("t0", d.get("time", 0.0))))
-            for *_, d in G.edges(data=True, keys=True)
-        )
+    if isinstance(G, EdgeArrays):
+        excess = np.where(G.has_t0, G.time.astype(np.float64) - G.t0, 0.0)
+        return float(np.dot(G.flow.astype(np.float64, copy=False), excess))
+    flow = _column(G, lambda d: d.get("flow", 0.0))
+    excess = _column(
+        G, lambda d: float(d.get("time", 0.0)) - float(d.get("t0", d.get("time", 0.0)))
     )
+    return float(np.dot(flow, excess))
 
 
-def top_bottlenecks(G: nx.MultiDiGraph, n: int = 20) -> list[dict[str, Any]]:
+def tstt_and_delay(G: nx.MultiDiGraph | EdgeState | EdgeArrays) -> tuple[float, float]:
+    """:func:`total_system_travel_time` and :func:`total_delay` from one read of the edges.
+
+    `flow` and `time` are read (and widened to float64) once for both sums
+    instead of once per metric; the results are the same as the two functions.
+
+    :param G: Directed multigraph whose edges contain `flow`, `time`, and optionally `t0`,
+        or the edge state / arrays returned by `msa_edge_state` / `msa_edge_arrays`.
+    :type G: nx.MultiDiGraph | EdgeState | EdgeArrays
+    :return: `(tstt, delay)`.
+    :rtype: tuple[float, float]
+    """
+    if isinstance(G, EdgeArrays):
+        flow = G.flow.astype(np.float64, copy=False)
+        time = G.time.astype(np.float64, copy=False)
+        excess = np.where(G.has_t0, time - G.t0, 0.0)
+    else:
+        n = G.number_of_edges() if isinstance(G, nx.Graph) else len(G)
+        table = np.fromiter(
+            (
+                (
+                    float(d.get("flow", 0.0)),
+                    float(d.get("time", 0.0)),
+                    float(d.get("time", 0.0)) - float(d.get("t0", d.get("time", 0.0))),
+                )
+                for *_, d in _iter_edges(G)
+            ),
+            dtype=np.dtype((np.float64, 3)),
+            count=n,
+        )
+        flow, time, excess = table[:, 0], table[:, 1], table[:, 2]
+    return float(np.dot(flow, time)), float(np.dot(flow, excess))
+
+
+def _bottleneck_arrays(
+    G: nx.MultiDiGraph | EdgeState | EdgeArrays,
+) -> tuple[list[tuple[Any, Any, int]], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Edges with aligned `flow`, `capacity`, `time` and `t0` arrays (`t0` missing -> 0.0)."""
+    if isinstance(G, EdgeArrays):
+        return G.edges, G.flow, G.capacity, G.time, np.where(G.has_t0, G.t0, 0.0)
+
+    edges = []
+    cols = []
+    for u, v, k, d in _iter_edges(G):
+        edges.append((u, v, k))
+        cols.append(
+            (
+                float(d.get("flow", 0.0)),
+                float(d.get("capacity", 1.0)),
+                float(d.get("time", 0.0)),
+                float(d.get("t0", 0.0)),
+            )
+        )
+    table = np.array(cols, dtype=np.float64).reshape(len(edges), 4)
+    return edges, table[:, 0], table[:, 1], table[:, 2], table[:, 3]
+
+
+def top_bottlenecks(
+    G: nx.MultiDiGraph | EdgeState | EdgeArrays, n: int = 20, as_frame: bool = False
+) -> list[dict[str, Any]] | pd.DataFrame:
     """Rank and return the top bottleneck edges by delay and volume/capacity.
 
     For each edge, this computes:
     - `v_c`: volume/capacity ratio (flow / capacity), with capacity<=0 treated as 0.0
     - `delay`: flow * (time - t0)
 
-    Results are sorted descending by `(delay, v_c)` and truncated to the top `n`.
+    Results are sorted descending by `(delay, v_c)` and truncated to the top `n`;
+    ties keep edge order. Only the top-`n` candidates are sorted (`np.partition`
+    on delay), not every edge.
 
-    :param G: Directed multigraph whose edges contain `flow`, `capacity`, `time`, and optionally `t0`.
-    :type G: nx.MultiDiGraph
+    :param G: Directed multigraph whose edges contain `flow`, `capacity`, `time`, and optionally `t0`,
+        or the edge state / arrays returned by `msa_edge_state` / `msa_edge_arrays`.
+    :type G: nx.MultiDiGraph | EdgeState | EdgeArrays
     :param n: Number of bottleneck rows to return, defaults to 20.
     :type n: int, optional
+    :param as_frame: Return a DataFrame built column-wise from the selected
+        arrays instead of per-row dicts, defaults to False.
+    :type as_frame: bool, optional
     :raises ValueError: If `n` is negative.
-    :return: A list of dict rows with keys: u, v, key, flow, capacity, v_c, delay.
-    :rtype: list[dict[str, Any]]
+    :return: A list of dict rows (or a DataFrame) with keys: u, v, key, flow, capacity, v_c, delay.
+    :rtype: list[dict[str, Any]] | pd.DataFrame
     """
     if n < 0:
         raise ValueError("n must be >= 0")
 
-    rows = []
-    for u, v, k, d in G.edges(keys=True, data=True):
-        flow = float(d.get("flow", 0.0))
-        cap = float(d.get("capacity", 1.0))
-        vc = flow / cap if cap > 0 else 0.0
-        delay = flow * (float(d.get("time", 0.0)) - float(d.get("t0", 0.0)))
-        rows.append(
-            {
-                "u": str(u),
-                "v": str(v),
-                "key": int(k),
-                "flow": flow,
-                "capacity": cap,
-                "v_c": vc,
-                "delay": delay,
-            }
-        )
-
-    rows.sort(key=lambda r: (r["delay"], r["v_c"]), reverse=True)
-    return rows[:n]
+    edges, flow, cap, time, t0 = _bottleneck_arrays(G)
+    if n == 0 or not edges:
+        return pd.DataFrame(columns=BOTTLENECK_COLUMNS) if as_frame else []
+
+    vc = np.divide(flow, cap, out=np.zeros_like(flow), where=cap > 0)
+    delay = flow * (time - t0)
+
+    if n < len(edges):
+        # every edge tied with the n-th largest delay stays a candidate for the v_c tie-break
+        kth = np.partition(delay, len(edges) - n)[len(edges) - n]
+        candidates = np.flatnonzero(delay >= kth)
+    else:
+        candidates = np.arange(len(edges))
+    top = candidates[np.lexsort((candidates, -vc[candidates], -delay[candidates]))][:n]
+
+    top_edges = [edges[i] for i in top.tolist()]
+    columns = {
+        "u": [str(u) for u, _, _ in top_edges],
+        "v": [str(v) for _, v, _ in top_edges],
+        "key": [int(k) for *_, k in top_edges],
+        "flow": flow[top],
+        "capacity": cap[top],
+        "v_c": vc[top],
+        "delay": delay[top],
+    }
+    if as_frame:
+        return pd.DataFrame(columns)
+    floats = {c: columns[c].tolist() for c in ("flow", "capacity", "v_c", "delay")}
+    return [
+        {"u": u, "v": v, "key": k, **{c: vals[i] for c, vals in floats.items()}}
+        for i, (u, v, k) in enumerate(zip(columns["u"], columns["v"], columns["key"], strict=True))
+    ]
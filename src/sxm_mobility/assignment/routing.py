@@ -0,0 +1,452 @@
+from __future__ import annotations
+
+import heapq
+import math
+import warnings
+from collections import defaultdict
+from collections.abc import Collection, Iterator, Mapping
+from typing import Any, Literal
+
+import networkx as nx
+import numpy as np
+from loguru import logger
+
+EdgeKey = tuple[Any, Any, int]
+
+#: Integer type of node, arc and edge ids in the index's arrays; halves their
+#: footprint (and cache traffic in compiled loops) against int64.
+NODE_DTYPE = np.int32
+
+
+class RoutingIndex:
+    """Integer adjacency of a graph's topology, reused across MSA iterations and scenarios.
+
+    Building it walks the graph once; each iteration then only re-weights the arcs
+    (:meth:`customize`) and runs one heap Dijkstra per origin over integer node ids,
+    instead of networkx re-resolving a weight callback for every edge it relaxes.
+    Parallel edges collapse into one arc per `(u, v)`; customizing picks the
+    fastest open key.
+
+    The index only depends on topology, so it stays valid for overlays that change
+    attributes or close edges (:class:`~sxm_mobility.scenarios.catalog.EdgeOverlay`),
+    but must be rebuilt for graphs with added edges.
+    """
+
+    #: Whether :func:`~sxm_mobility.assignment._kernels.msa_core` may run the
+    #: searches itself (on the CPU) instead of calling this index.
+    compiled_core = True
+
+    def __init__(self, G: nx.MultiDiGraph) -> None:
+        self.nodes: list[Any] = list(G.nodes)
+        self.node_index: dict[Any, int] = {n: i for i, n in enumerate(self.nodes)}
+        self.arc_edges: list[list[EdgeKey]] = []
+        self.arc_tail: list[int] = []
+        self.adj: list[list[tuple[int, int]]] = [[] for _ in self.nodes]
+
+        for u, nbrs in G.adjacency():
+            ui = self.node_index[u]
+            for v, keydict in nbrs.items():
+                self.adj[ui].append((self.node_index[v], len(self.arc_edges)))
+                self.arc_edges.append([(u, v, k) for k in keydict])
+                self.arc_tail.append(ui)
+
+    def csr(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Adjacency as int32 CSR arrays `(indptr, heads, arc ids, arc tails)`.
+
+        Arcs of node `u` are `arc_ids[indptr[u]:indptr[u + 1]]` in the same order as
+        `adj[u]`, so compiled searches relax (and break ties) like :meth:`shortest_path_tree`.
+        """
+        cached = getattr(self, "_csr", None)
+        if cached is None:
+            indptr = np.zeros(len(self.nodes) + 1, dtype=NODE_DTYPE)
+            np.cumsum([len(out) for out in self.adj], out=indptr[1:])
+            heads = np.array([v for out in self.adj for v, _ in out], dtype=NODE_DTYPE)
+            arcs = np.array([arc for out in self.adj for _, arc in out], dtype=NODE_DTYPE)
+            cached = self._csr = (indptr, heads, arcs, np.asarray(self.arc_tail, dtype=NODE_DTYPE))
+        return cached
+
+    def od_arrays(
+        self, od: list[tuple[Any, Any, float]]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """OD pairs with known nodes as `(origins, dest offsets, dests, demands)` grouped by origin.
+
+        Node ids and offsets are int32, demands float64.
+        """
+        _, by_origin = self._group_by_origin(od)
+        origins = np.fromiter(by_origin, dtype=NODE_DTYPE, count=len(by_origin))
+        offsets = np.zeros(len(by_origin) + 1, dtype=NODE_DTYPE)
+        np.cumsum([len(dests) for dests in by_origin.values()], out=offsets[1:])
+        pairs = [pair for dests in by_origin.values() for pair in dests]
+        dests = np.array([d for d, _ in pairs], dtype=NODE_DTYPE)
+        demands = np.array([dem for _, dem in pairs], dtype=np.float64)
+        return origins, offsets, dests, demands
+
+    def customize(
+        self, state: Mapping[EdgeKey, Mapping[str, float]]
+    ) -> tuple[list[float], list[EdgeKey | None]]:
+        """Per-arc travel time and the edge carrying it, read from `state`.
+
+        Edges absent from `state` are closed; an arc with no open edge gets an
+        infinite weight and is never relaxed.
+
+        :return: `(weights, best_edges)`, both indexed by arc id.
+        :rtype: tuple[list[float], list[EdgeKey | None]]
+        """
+        weights: list[float] = []
+        best_edges: list[EdgeKey | None] = []
+        for edges in self.arc_edges:
+            best_t, best_e = float("inf"), None
+            for e in edges:
+                s = state.get(e)
+                if s is not None and s.get("time", 1.0) < best_t:
+                    best_t, best_e = s.get("time", 1.0), e
+            weights.append(best_t)
+            best_edges.append(best_e)
+        return weights, best_edges
+
+    def shortest_path_tree(
+        self, source: int, weights: list[float], targets: Collection[int] = ()
+    ) -> list[int]:
+        """Dijkstra from node id `source`; returns the predecessor arc of every node (-1 if none).
+
+        With `targets`, the search stops once all of them are settled, so only
+        their predecessor chains are guaranteed complete.
+        """
+        dist = [float("inf")] * len(self.nodes)
+        pred = [-1] * len(self.nodes)
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        adj = self.adj
+        remaining = set(targets)
+        while heap:
+            du, u = heapq.heappop(heap)
+            if du > dist[u]:
+                continue
+            if remaining:
+                remaining.discard(u)
+                if not remaining:
+                    break
+            for v, arc in adj[u]:
+                dv = du + weights[arc]
+                if dv < dist[v]:
+                    dist[v] = dv
+                    pred[v] = arc
+                    heapq.heappush(heap, (dv, v))
+        return pred
+
+    def arc_edge_ids(self, edge_id: Mapping[EdgeKey, int]) -> np.ndarray:
+        """Edge ids of every arc's parallel edges, `-1`-padded, for :meth:`customize_arrays`.
+
+        Edges missing from `edge_id` (closed) are `-1` as well.
+
+        :rtype: np.ndarray
+        """
+        width = max((len(edges) for edges in self.arc_edges), default=1)
+        ids = np.full((len(self.arc_edges), width), -1, dtype=NODE_DTYPE)
+        for arc, edges in enumerate(self.arc_edges):
+            ids[arc, : len(edges)] = [edge_id.get(e, -1) for e in edges]
+        return ids
+
+    def customize_arrays(
+        self, time: np.ndarray, arc_edge_ids: np.ndarray
+    ) -> tuple[list[float], list[int]]:
+        """Array counterpart of :meth:`customize`: arc weights and best edge ids from a time vector."""
+        # padding (-1) reads the appended inf, so closed slots never win
+        times = np.append(time, np.inf)[arc_edge_ids]
+        best = times.argmin(axis=1)
+        rows = np.arange(len(best))
+        return times[rows, best].tolist(), arc_edge_ids[rows, best].tolist()
+
+    def route(
+        self,
+        od: list[tuple[Any, Any, float]],
+        state: Mapping[EdgeKey, Mapping[str, float]],
+    ) -> Iterator[tuple[float, list[EdgeKey] | None]]:
+        """Yield `(demand, edges)` for every OD pair, `edges=None` if it cannot be routed.
+
+        Pairs are grouped by origin and yielded origin by origin: each origin runs
+        one Dijkstra that stops once all of its destinations are settled.
+        """
+        weights, best_edges = self.customize(state)
+        for demand, arcs in self._arc_paths(od, weights):
+            yield demand, None if arcs is None else [best_edges[a] for a in arcs]
+
+    def route_ids(
+        self,
+        od: list[tuple[Any, Any, float]],
+        time: np.ndarray,
+        arc_edge_ids: np.ndarray,
+    ) -> Iterator[tuple[float, list[int] | None]]:
+        """Like :meth:`route`, but weighted by a time vector and yielding edge ids."""
+        weights, best_ids = self.customize_arrays(time, arc_edge_ids)
+        for demand, arcs in self._arc_paths(od, weights):
+            yield demand, None if arcs is None else [best_ids[a] for a in arcs]
+
+    def _group_by_origin(
+        self, od: list[tuple[Any, Any, float]]
+    ) -> tuple[list[float], dict[int, list[tuple[int, float]]]]:
+        """Split `od` into demands of pairs with unknown nodes and `{origin: [(dest, demand)]}`."""
+        unknown: list[float] = []
+        by_origin: dict[int, list[tuple[int, float]]] = defaultdict(list)
+        for o, d, demand in od:
+            oi, di = self.node_index.get(o), self.node_index.get(d)
+            if oi is None or di is None:
+                unknown.append(float(demand))
+            else:
+                by_origin[oi].append((di, float(demand)))
+        return unknown, by_origin
+
+    def _arc_paths(
+        self, od: list[tuple[Any, Any, float]], weights: list[float]
+    ) -> Iterator[tuple[float, list[int] | None]]:
+        """Yield `(demand, arc ids)` per OD pair, `None` when unreachable."""
+        unknown, by_origin = self._group_by_origin(od)
+        for demand in unknown:
+            yield demand, None
+
+        arc_tail = self.arc_tail
+        for oi, dests in by_origin.items():
+            pred = self.shortest_path_tree(oi, weights, targets=[di for di, _ in dests])
+            for di, demand in dests:
+                arcs: list[int] = []
+                node = di
+                while node != oi:
+                    arc = pred[node]
+                    if arc < 0:
+                        break
+                    arcs.append(arc)
+                    node = arc_tail[arc]
+                else:
+                    arcs.reverse()
+                    yield demand, arcs
+                    continue
+                yield demand, None
+
+
+class IGraphRoutingIndex(RoutingIndex):
+    """:class:`RoutingIndex` whose Dijkstra runs in igraph's C core.
+
+    The igraph graph mirrors the arcs (edge id == arc id) and is built once;
+    each query only passes a fresh weight vector.
+    """
+
+    def __init__(self, G: nx.MultiDiGraph) -> None:
+        try:
+            import igraph as ig
+        except ImportError as e:
+            raise ImportError("Install routing extras: `uv sync --extra routing`") from e
+
+        super().__init__(G)
+        arc_head = [0] * len(self.arc_edges)
+        for out in self.adj:
+            for v, arc in out:
+                arc_head[arc] = v
+        self.igraph = ig.Graph(
+            n=len(self.nodes), edges=list(zip(self.arc_tail, arc_head, strict=True)), directed=True
+        )
+
+    def _arc_paths(
+        self, od: list[tuple[Any, Any, float]], weights: list[float]
+    ) -> Iterator[tuple[float, list[int] | None]]:
+        """Same contract as :meth:`RoutingIndex._arc_paths`, one igraph query per origin."""
+        unknown, by_origin = self._group_by_origin(od)
+        for demand in unknown:
+            yield demand, None
+
+        for oi, dests in by_origin.items():
+            with warnings.catch_warnings():
+                # unreachable destinations are reported below as unroutable
+                warnings.simplefilter("ignore", RuntimeWarning)
+                epaths = self.igraph.get_shortest_paths(
+                    oi, to=[di for di, _ in dests], weights=weights, output="epath"
+                )
+            for (di, demand), arcs in zip(dests, epaths, strict=True):
+                # igraph walks infinite (closed) arcs when nothing else reaches `di`
+                if (not arcs and di != oi) or any(math.isinf(weights[a]) for a in arcs):
+                    yield demand, None
+                else:
+                    yield demand, arcs
+
+
+class ScipyRoutingIndex(RoutingIndex):
+    """:class:`RoutingIndex` answering a batch of origins with one scipy csgraph Dijkstra.
+
+    The CSR layout (arcs sorted by tail) is fixed at build time; each query only
+    permutes the arc weights into it, then walks the returned predecessor rows.
+    """
+
+    #: Origins per csgraph call; bounds the `(batch, n_nodes)` predecessor matrix.
+    batch_size = 256
+
+    def __init__(self, G: nx.MultiDiGraph) -> None:
+        try:
+            from scipy.sparse import csgraph  # noqa: F401
+        except ImportError as e:
+            raise ImportError("Install routing extras: `uv sync --extra routing`") from e
+
+        super().__init__(G)
+        tails = np.asarray(self.arc_tail, dtype=np.int64)
+        heads = np.zeros(len(tails), dtype=np.int64)
+        for out in self.adj:
+            for v, arc in out:
+                heads[arc] = v
+        self._csr_arc = np.lexsort((heads, tails))
+        self._csr_indices = heads[self._csr_arc].astype(NODE_DTYPE)
+        self._csr_indptr = np.zeros(len(self.nodes) + 1, dtype=NODE_DTYPE)
+        np.cumsum(np.bincount(tails, minlength=len(self.nodes)), out=self._csr_indptr[1:])
+        self._arc_by_pair = {
+            (u, v): arc
+            for arc, (u, v) in enumerate(zip(tails.tolist(), heads.tolist(), strict=True))
+        }
+
+    def _arc_paths(
+        self, od: list[tuple[Any, Any, float]], weights: list[float]
+    ) -> Iterator[tuple[float, list[int] | None]]:
+        """Same contract as :meth:`RoutingIndex._arc_paths`, origins batched through scipy."""
+        from scipy.sparse import csr_array
+        from scipy.sparse.csgraph import dijkstra
+
+        unknown, by_origin = self._group_by_origin(od)
+        for demand in unknown:
+            yield demand, None
+
+        n = len(self.nodes)
+        graph = csr_array(
+            (np.asarray(weights)[self._csr_arc], self._csr_indices, self._csr_indptr), shape=(n, n)
+        )
+        arc_by_pair = self._arc_by_pair
+        origins = list(by_origin)
+        for start in range(0, len(origins), self.batch_size):
+            batch = origins[start : start + self.batch_size]
+            # closed arcs carry inf weights and are never used as predecessors
+            _, pred = dijkstra(graph, directed=True, indices=batch, return_predecessors=True)
+            for oi, row in zip(batch, pred, strict=True):
+                yield from _node_pred_paths(row.tolist(), oi, by_origin[oi], arc_by_pair)
+
+
+class CuGraphRoutingIndex(RoutingIndex):
+    """:class:`RoutingIndex` running each origin's shortest paths on the GPU with cuGraph.
+
+    Every query uploads one edge list (arc tails/heads fixed at build time, fresh
+    weights) and runs `cugraph.sssp` per origin; predecessors come back to the
+    host for the path walk. Worth it only for large networks and many origins:
+    queries with fewer than `min_gpu_origins` origins stay on the CPU. MSA runs
+    over this index call it every iteration instead of the compiled CPU core.
+    """
+
+    compiled_core = False
+
+    #: Below this many origins a query runs the CPU heap Dijkstra instead.
+    min_gpu_origins = 64
+
+    def __init__(self, G: nx.MultiDiGraph) -> None:
+        try:
+            import cudf  # noqa: F401
+            import cugraph  # noqa: F401
+        except ImportError as e:
+            # not an extra: current cuGraph wheels pin cudf to pandas 3, which the locked stack is not on
+            raise ImportError("Install cuGraph for CUDA 12: `uv pip install cugraph-cu12`") from e
+
+        super().__init__(G)
+        tails = np.asarray(self.arc_tail, dtype=NODE_DTYPE)
+        heads = np.zeros(len(tails), dtype=NODE_DTYPE)
+        for out in self.adj:
+            for v, arc in out:
+                heads[arc] = v
+        self._tails, self._heads = tails, heads
+        self._arc_by_pair = {
+            (u, v): arc
+            for arc, (u, v) in enumerate(zip(tails.tolist(), heads.tolist(), strict=True))
+        }
+
+    def _arc_paths(
+        self, od: list[tuple[Any, Any, float]], weights: list[float]
+    ) -> Iterator[tuple[float, list[int] | None]]:
+        """Same contract as :meth:`RoutingIndex._arc_paths`, one `cugraph.sssp` per origin."""
+        import cudf
+        import cugraph
+
+        unknown, by_origin = self._group_by_origin(od)
+        if len(by_origin) < self.min_gpu_origins:
+            yield from super()._arc_paths(od, weights)
+            return
+        for demand in unknown:
+            yield demand, None
+
+        # closed (infinite) arcs are left out of the GPU graph
+        w = np.asarray(weights, dtype=np.float64)
+        open_ = np.isfinite(w)
+        graph = cugraph.Graph(directed=True)
+        graph.from_cudf_edgelist(
+            cudf.DataFrame(
+                {"src": self._tails[open_], "dst": self._heads[open_], "weight": w[open_]}
+            ),
+            source="src",
+            destination="dst",
+            edge_attr="weight",
+            renumber=False,
+        )
+        n = len(self.nodes)
+        arc_by_pair = self._arc_by_pair
+        for oi, dests in by_origin.items():
+            result = cugraph.sssp(graph, source=oi)
+            # vertices missing from the result (no open arcs) stay unreached
+            row = np.full(n, -1, dtype=np.int64)
+            row[result["vertex"].to_numpy()] = result["predecessor"].to_numpy()
+            yield from _node_pred_paths(row.tolist(), oi, dests, arc_by_pair)
+
+
+def _node_pred_paths(
+    row: list[int],
+    oi: int,
+    dests: list[tuple[int, float]],
+    arc_by_pair: Mapping[tuple[int, int], int],
+) -> Iterator[tuple[float, list[int] | None]]:
+    """Walk a node-predecessor row from origin `oi` back from every destination.
+
+    :return: `(demand, arc ids)` per destination, `None` when unreachable.
+    """
+    for di, demand in dests:
+        arcs: list[int] = []
+        node = di
+        while node != oi:
+            u = row[node]
+            if u < 0:
+                break
+            arcs.append(arc_by_pair[(u, node)])
+            node = u
+        else:
+            arcs.reverse()
+            yield demand, arcs
+            continue
+        yield demand, None
+
+
+_BACKENDS: dict[str, type[RoutingIndex]] = {
+    "cugraph": CuGraphRoutingIndex,
+    "scipy": ScipyRoutingIndex,
+    "igraph": IGraphRoutingIndex,
+    "python": RoutingIndex,
+}
+
+
+def build_routing_index(
+    G: nx.MultiDiGraph, backend: Literal["auto", "cugraph", "scipy", "igraph", "python"] = "auto"
+) -> RoutingIndex:
+    """Routing index for `G` on `backend`.
+
+    `"auto"` picks scipy, then igraph, then pure Python, whichever is installed
+    first. The GPU backend (`"cugraph"`) is only used when named; when a named
+    backend is not installed, this falls back to `"auto"` with a warning.
+    """
+    if backend != "auto":
+        try:
+            return _BACKENDS[backend](G)
+        except ImportError as e:
+            logger.warning(f"Routing backend {backend!r} unavailable ({e}); falling back to auto")
+    for cls in (ScipyRoutingIndex, IGraphRoutingIndex):
+        try:
+            return cls(G)
+        except ImportError:
+            continue
+    return RoutingIndex(G)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import numpy.typing as npt
+
+from sxm_mobility.assignment.routing import NODE_DTYPE, EdgeKey
+
+EdgeState = dict[EdgeKey, dict[str, float]]
+
+# `G.graph` key of the cached base arrays; underscore keys are skipped by graph exports
+_SOA_KEY = "_soa"
+
+
+@dataclass
+class EdgeArrays:
+    """Per-edge assignment attributes as aligned numpy arrays (struct of arrays).
+
+    Edge id `i` is `edges[i]`; `edge_id` is the reverse lookup. `t0` holds 1.0
+    where the edge has no free-flow time, which `has_t0` records.
+    """
+
+    edges: list[EdgeKey]
+    t0: np.ndarray
+    capacity: np.ndarray
+    flow: np.ndarray
+    time: np.ndarray
+    has_t0: np.ndarray
+    edge_id: dict[EdgeKey, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.edge_id = {e: i for i, e in enumerate(self.edges)}
+
+    @classmethod
+    def from_graph(
+        cls,
+        G: nx.MultiDiGraph,
+        overrides: Mapping[EdgeKey, Mapping[str, float]] | None = None,
+        excluded: Collection[EdgeKey] = frozenset(),
+    ) -> EdgeArrays:
+        """Read `t0`, `capacity`, `flow` and the initial `time` off `G` in one pass.
+
+        :param overrides: Attribute replacements per edge, applied on top of `G`.
+        :param excluded: Edges to leave out (closed).
+        :rtype: EdgeArrays
+        """
+        overrides = overrides or {}
+        edges: list[EdgeKey] = []
+        rows: list[tuple[float, float, float, float, bool]] = []
+        for u, v, k, data in G.edges(keys=True, data=True):
+            e = (u, v, k)
+            if e in excluded:
+                continue
+            attrs = {**data, **overrides[e]} if e in overrides else data
+            edges.append(e)
+            rows.append(
+                (
+                    float(attrs.get("t0", 1.0)),
+                    float(attrs.get("capacity", 1.0)),
+                    float(attrs.get("flow", 0.0)),
+                    float(attrs.get("t0", attrs.get("time", 1.0))),
+                    "t0" in attrs,
+                )
+            )
+        table = np.array(rows, dtype=np.float64).reshape(len(edges), 5)
+        t0, capacity, flow, time = (np.ascontiguousarray(table[:, i]) for i in range(4))
+        return cls(edges, t0, capacity, flow, time, table[:, 4].astype(bool))
+
+    def with_overlay(
+        self,
+        overrides: Mapping[EdgeKey, Mapping[str, float]] | None = None,
+        excluded: Collection[EdgeKey] = frozenset(),
+        dtype: npt.DTypeLike = np.float64,
+    ) -> EdgeArrays:
+        """Fresh copy with `overrides` applied and `excluded` edges dropped.
+
+        Equivalent to :meth:`from_graph` with the same arguments on the graph these
+        arrays were read from, without walking the graph again.
+
+        :param dtype: Float type of the copied `t0`/`capacity`/`flow`/`time`
+            (`np.float32` halves their memory traffic in the assignment loop).
+        :rtype: EdgeArrays
+        """
+        t0, capacity, flow, time = (
+            a.astype(dtype) for a in (self.t0, self.capacity, self.flow, self.time)
+        )
+        has_t0 = self.has_t0.copy()
+        for e, attrs in (overrides or {}).items():
+            i = self.edge_id.get(e)
+            if i is None:
+                continue
+            if "t0" in attrs:
+                t0[i] = time[i] = float(attrs["t0"])
+                has_t0[i] = True
+            elif "time" in attrs and not has_t0[i]:
+                time[i] = float(attrs["time"])
+            if "capacity" in attrs:
+                capacity[i] = float(attrs["capacity"])
+            if "flow" in attrs:
+                flow[i] = float(attrs["flow"])
+
+        edges = self.edges
+        drop = [self.edge_id[e] for e in excluded if e in self.edge_id]
+        if drop:
+            keep = np.ones(len(edges), dtype=bool)
+            keep[drop] = False
+            edges = [e for e, k in zip(edges, keep.tolist(), strict=True) if k]
+            t0, capacity, flow, time, has_t0 = (a[keep] for a in (t0, capacity, flow, time, has_t0))
+        return EdgeArrays(list(edges), t0, capacity, flow, time, has_t0)
+
+    def to_state(self) -> EdgeState:
+        """Per-edge dicts in the :data:`EdgeState` layout (`t0` only where the edge had one)."""
+        state: EdgeState = {}
+        for e, t0, cap, flow, time, has_t0 in zip(
+            self.edges,
+            self.t0.tolist(),
+            self.capacity.tolist(),
+            self.flow.tolist(),
+            self.time.tolist(),
+            self.has_t0.tolist(),
+            strict=True,
+        ):
+            s = {"capacity": cap, "flow": flow, "time": time}
+            if has_t0:
+                s["t0"] = t0
+            state[e] = s
+        return state
+
+
+def build_or_get_soa(G: nx.MultiDiGraph) -> EdgeArrays:
+    """Base :class:`EdgeArrays` of `G`, built once and cached in `G.graph`.
+
+    The cache is keyed on `(id(G), number of edges)`, so copies and topology
+    changes rebuild it. Changing `t0`/`capacity`/`flow`/`time` attributes in place
+    does not: call :func:`invalidate_soa` after such edits.
+    :func:`~sxm_mobility.assignment.msa.msa_traffic_assignment` refreshes it with
+    the flows and times it writes back.
+
+    :return: The cached instance; treat it as read-only and use
+        :meth:`EdgeArrays.with_overlay` for a working copy.
+    :rtype: EdgeArrays
+    """
+    key = (id(G), G.number_of_edges())
+    cached = G.graph.get(_SOA_KEY)
+    if cached is None or cached[0] != key:
+        cached = G.graph[_SOA_KEY] = (key, EdgeArrays.from_graph(G))
+    return cached[1]
+
+
+def store_soa(G: nx.MultiDiGraph, arrays: EdgeArrays) -> None:
+    """Cache `arrays` (read from `G` with no overlay) as the base arrays of `G`."""
+    G.graph[_SOA_KEY] = ((id(G), G.number_of_edges()), arrays)
+
+
+def invalidate_soa(G: nx.MultiDiGraph) -> tuple | None:
+    """Drop the cached base arrays of `G` (after editing edge attributes in place).
+
+    :return: The dropped cache entry (None if there was none), for :func:`restore_soa`.
+    :rtype: tuple | None
+    """
+    return G.graph.pop(_SOA_KEY, None)
+
+
+def restore_soa(G: nx.MultiDiGraph, entry: tuple | None) -> None:
+    """Put back a cache entry returned by :func:`invalidate_soa` (after undoing temporary edits)."""
+    if entry is None:
+        G.graph.pop(_SOA_KEY, None)
+    else:
+        G.graph[_SOA_KEY] = entry
+
+
+def save_soa(G: nx.MultiDiGraph, path: str | Path) -> None:
+    """Save the assignment view of `G` as one compressed `.npz` (compact engine artifact).
+
+    Holds the node ids (int64 when they are all integers, strings otherwise),
+    int32 `u`/`v` positions into them, edge keys and the :class:`EdgeArrays`
+    columns; other attributes (geometry, names, ...) are not kept. Loading it
+    skips the per-edge Python objects of a pickled or Arrow graph.
+
+    :param G: Graph to save.
+    :type G: nx.MultiDiGraph
+    :param path: Destination file path.
+    :type path: str | Path
+    :raises OSError: If the destination directory cannot be created or file cannot be written.
+    :return: None
+    :rtype: None
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = build_or_get_soa(G)
+    nodes = list(G.nodes)
+    node_ids = np.asarray(nodes)
+    if node_ids.dtype.kind not in "iu":
+        node_ids = np.asarray([str(n) for n in nodes])
+    position = {n: i for i, n in enumerate(nodes)}
+    with path.open("wb") as f:
+        np.savez_compressed(
+            f,
+            nodes=node_ids,
+            u=np.fromiter(
+                (position[u] for u, _, _ in arrays.edges), dtype=NODE_DTYPE, count=len(arrays.edges)
+            ),
+            v=np.fromiter(
+                (position[v] for _, v, _ in arrays.edges), dtype=NODE_DTYPE, count=len(arrays.edges)
+            ),
+            key=np.fromiter(
+                (k for *_, k in arrays.edges), dtype=NODE_DTYPE, count=len(arrays.edges)
+            ),
+            t0=arrays.t0,
+            capacity=arrays.capacity,
+            flow=arrays.flow,
+            time=arrays.time,
+            has_t0=arrays.has_t0,
+        )
+
+
+def load_soa(path: str | Path, as_graph: bool = False) -> EdgeArrays | nx.MultiDiGraph:
+    """Load an artifact written by :func:`save_soa`.
+
+    :param path: Path to the `.npz` file.
+    :type path: str | Path
+    :param as_graph: Rebuild a `MultiDiGraph` (nodes in saved order, edges with
+        `t0`/`capacity`/`flow`/`time`) with the arrays already cached on it,
+        defaults to False.
+    :type as_graph: bool, optional
+    :raises OSError: If the file cannot be read.
+    :return: The edge arrays, or the rebuilt graph with `as_graph`.
+    :rtype: EdgeArrays | nx.MultiDiGraph
+    """
+    with np.load(Path(path)) as f:
+        nodes = f["nodes"]
+        edges = list(
+            zip(nodes[f["u"]].tolist(), nodes[f["v"]].tolist(), f["key"].tolist(), strict=True)
+        )
+        arrays = EdgeArrays(edges, f["t0"], f["capacity"], f["flow"], f["time"], f["has_t0"])
+        node_list = nodes.tolist()
+    if not as_graph:
+        return arrays
+
+    G = nx.MultiDiGraph()
+    G.add_nodes_from(node_list)
+    G.add_edges_from((u, v, k, attrs) for (u, v, k), attrs in arrays.to_state().items())
+    store_soa(G, arrays)
+    return G
@@ -1,23 +1,30 @@
 from __future__ import annotations
 
+import os
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+from types import UnionType
+from typing import Any, Literal, Union, get_args, get_origin, get_type_hints
 
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+_ENV_PREFIX = "SXM_"
 
 
-class Settings(BaseSettings):
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Runtime configuration.
 
-    Configure via environment variables or a local .env (not committed).
+    Configure via `SXM_`-prefixed environment variables (e.g. `SXM_MSA_ITERS=50`),
+    read by :meth:`from_env`.
     """
 
-    model_config = SettingsConfigDict(env_prefix="SXM_", extra="ignore")
-
-    project_root: Path = Field(default_factory=lambda: Path(__file__).resolve().parents[2])
+    project_root: Path = field(default_factory=lambda: Path(__file__).resolve().parents[2])
 
     # Data paths
-    data_dir: Path = Field(default_factory=lambda: Path("data"))
+    data_dir: Path = field(default_factory=lambda: Path("data"))
+    # downloaded OSM graphs, memoized per query (None = always download)
+    graph_cache_dir: Path | None = field(
+        default_factory=lambda: Path.home() / ".cache" / "sxm_mobility"
+    )
 
     # Geography
     place_query: str = "Sint Maarten"
@@ -28,6 +35,51 @@ class Settings(BaseSettings):
     bpr_beta: float = 4.0
 
     msa_iters: int = 30
+    # stop MSA early once |x_k - x_(k-1)| / |x_k| < tol (0 = always run msa_iters)
+    msa_rel_gap_tol: float = 1e-3
+    # float type of the per-edge assignment arrays; "float32" halves their memory traffic
+    msa_dtype: Literal["float64", "float32"] = "float64"
+
+    # Scenario sweeps (None = one worker per CPU)
+    scenario_workers: int | None = None
+
+    @classmethod
+    def from_env(cls, environ: dict[str, str] | None = None) -> Settings:
+        """Settings with every field overridable by `SXM_<FIELD>` in `environ`.
+
+        :param environ: Variables to read, defaults to `os.environ`.
+        :type environ: dict[str, str] | None, optional
+        :raises ValueError: If a variable cannot be converted to its field's type.
+        :rtype: Settings
+        """
+        environ = os.environ if environ is None else environ
+        hints = get_type_hints(cls)
+        overrides: dict[str, Any] = {}
+        for f in fields(cls):
+            raw = environ.get(_ENV_PREFIX + f.name.upper())
+            if raw is not None:
+                try:
+                    overrides[f.name] = _parse_env(raw, hints[f.name])
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"Invalid {_ENV_PREFIX}{f.name.upper()}={raw!r}: {e}") from e
+        return cls(**overrides)
+
+
+def _parse_env(raw: str, hint: Any) -> Any:
+    """Convert an environment string to the field type `hint`."""
+    origin = get_origin(hint)
+    if origin is Literal:
+        if raw not in get_args(hint):
+            raise ValueError(f"expected one of {get_args(hint)}")
+        return raw
+    if origin in (Union, UnionType):
+        if raw.strip().lower() in ("", "none", "null"):
+            return None
+        (inner,) = (a for a in get_args(hint) if a is not type(None))
+        return _parse_env(raw, inner)
+    if hint is bool:
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    return hint(raw)
 
 
-settings = Settings()
+settings = Settings.from_env()
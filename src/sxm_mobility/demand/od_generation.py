@@ -1,8 +1,8 @@
 from __future__ import annotations
-import random
-from typing import Iterable
+from typing import Any
 import networkx as nx
-import random
+import numpy as np
+
 
 def random_od(
     G: "nx.Graph",
@@ -11,7 +11,7 @@ def random_od(
     max_demand: float = 150.0,
     seed: int = 42,
 ) -> list[tuple[Any, Any, float]]:
-    """Generate random(Because you don’t yet have real travel demand data (mobile-phone OD matrices, traffic counts per zone, surveys, etc.)) 
+    """Generate random(Because you don’t yet have real travel demand data (mobile-phone OD matrices, traffic counts per zone, surveys, etc.))
     origin-destination (OD) demand pairs from a graph's nodes.
 
     Samples `n_pairs` (origin, destination) node pairs uniformly at random from `G.nodes`,
@@ -43,24 +43,47 @@ def random_od(
             commuter patterns
             observed traffic counts
     """
-    rng = random.Random(seed)
     nodes = list(G.nodes)
+    origins, dests, demands = random_od_arrays(
+        G, n_pairs=n_pairs, min_demand=min_demand, max_demand=max_demand, seed=seed
+    )
+    return [
+        (nodes[o], nodes[d], demand)
+        for o, d, demand in zip(origins.tolist(), dests.tolist(), demands.tolist(), strict=True)
+    ]
+
+
+def random_od_arrays(
+    G: nx.Graph,
+    n_pairs: int = 250,
+    min_demand: float = 50.0,
+    max_demand: float = 150.0,
+    seed: int = 42,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sample random OD pairs as parallel arrays (see :func:`random_od`).
+
+    All pairs are drawn in a few vectorized NumPy calls; destinations that hit
+    their origin are redrawn together until none is left.
+
+    :return: `(origins, destinations, demands)`: int32 positions in `list(G.nodes)`
+        and float64 demands, each of length `n_pairs`.
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    n_nodes = G.number_of_nodes()
 
     if n_pairs < 0:
         raise ValueError("n_pairs must be >= 0")
     if min_demand > max_demand:
         raise ValueError("min_demand must be <= max_demand")
-    if len(nodes) < 2:
+    if n_nodes < 2:
         raise ValueError("G must contain at least 2 nodes to generate OD pairs")
 
-    od = []
-    for _ in range(n_pairs):
-        o = rng.choice(nodes)
-        d = rng.choice(nodes)
-        while d == o:
-            d = rng.choice(nodes)
-
-        demand = rng.uniform(min_demand, max_demand)
-        od.append((o, d, demand))
-
-    return od
+    rng = np.random.default_rng(seed)
+    origins = rng.integers(0, n_nodes, size=n_pairs, dtype=np.int32)
+    dests = rng.integers(0, n_nodes, size=n_pairs, dtype=np.int32)
+    same = np.flatnonzero(origins == dests)
+    while same.size:
+        dests[same] = rng.integers(0, n_nodes, size=same.size, dtype=np.int32)
+        same = same[origins[same] == dests[same]]
+    demands = rng.uniform(min_demand, max_demand, size=n_pairs)
+    return origins, dests, demands
@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+import gzip
 import json
 import pickle
+from collections.abc import Collection
 from pathlib import Path
 from typing import Any
 
 import networkx as nx
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+from pyarrow import feather
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Nullable dtypes of the edge join keys shared by `edges.parquet` and result tables.
+# OSM node ids already exceed uint32 (13.4e9 in Sint Maarten), so `u`/`v` stay
+# 64-bit; parallel-edge keys are tiny, so `key` is narrowed (overflow raises).
+ID_DTYPES: dict[str, str] = {"u": "Int64", "v": "Int64", "key": "UInt8"}
+
+# Write options for every parquet artifact (pyarrow `write_table` kwargs): zstd is
+# ~2x smaller than the default snappy at similar decode speed.
+PARQUET_OPTIONS: dict[str, object] = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "row_group_size": 65_536,
+}
 
 
 def download_osm_graph(place_query: str, network_type: str = "drive") -> nx.MultiDiGraph:
@@ -32,6 +54,54 @@ def download_osm_graph(place_query: str, network_type: str = "drive") -> nx.Mult
     return nx.MultiDiGraph(G)
 
 
+def _json_list(v: Any) -> str:
+    return json.dumps(list(v), ensure_ascii=False)
+
+
+def _json_dict(v: Any) -> str:
+    return json.dumps(v, ensure_ascii=False)
+
+
+def _wkt(v: Any) -> str:
+    return v.wkt
+
+
+def _identity(v: Any) -> Any:
+    return v
+
+
+def _empty(_: Any) -> str:
+    return ""
+
+
+# Exact-type handlers for the per-attribute sanitizers below: one dict lookup per
+# value instead of an isinstance chain. Subclasses (e.g. NumPy scalars) and
+# unknown types miss and take the generic path.
+_GEOMETRY_TYPES = (
+    shapely.Point,
+    shapely.LineString,
+    shapely.LinearRing,
+    shapely.Polygon,
+    shapely.MultiPoint,
+    shapely.MultiLineString,
+    shapely.MultiPolygon,
+    shapely.GeometryCollection,
+)
+_GRAPHML_SAFE: dict[type, Any] = {
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+    type(None): _empty,
+    list: _json_list,
+    tuple: _json_list,
+    set: _json_list,
+    dict: _json_dict,
+    **dict.fromkeys(_GEOMETRY_TYPES, _wkt),
+}
+_JSON_STRING: dict[type, Any] = {**_GRAPHML_SAFE, int: str, float: str, bool: str}
+
+
 def _graphml_safe_value(v: Any) -> Any:
     """Convert common non-GraphML types to GraphML-safe scalar values.
 
@@ -43,8 +113,9 @@ def _graphml_safe_value(v: Any) -> Any:
     :return: A GraphML-safe scalar value (str/int/float/bool) or string fallback.
     :rtype: Any
     """
-    if v is None:
-        return ""
+    handler = _GRAPHML_SAFE.get(type(v))
+    if handler is not None:
+        return handler(v)
 
     if isinstance(v, (str, int, float, bool)):
         return v
@@ -70,23 +141,26 @@ def make_graph_graphml_safe(G: nx.MultiDiGraph) -> nx.MultiDiGraph:
 
     :param G: Input graph with potentially complex attribute types.
     :type G: nx.MultiDiGraph
-    :return: A copied graph with sanitized graph/node/edge attributes.
+    :return: A new graph with sanitized graph/node/edge attributes; `G` is not modified.
     :rtype: nx.MultiDiGraph
     """
-    H = G.copy()
+    # Build the copy in one pass with already-safe attr dicts instead of copying
+    # `G` and rewriting every attribute afterwards (which held both versions at once).
+    safe = _graphml_safe_value
+    H = G.__class__()
 
     # Graph-level attrs
-    H.graph = {k: _graphml_safe_value(v) for k, v in H.graph.items()}
+    # underscore keys are in-memory caches (e.g. the SoA edge arrays), not data
+    H.graph.update((k, safe(v)) for k, v in G.graph.items() if not str(k).startswith("_"))
 
     # Node attrs
-    for _, data in H.nodes(data=True):
-        for k, v in list(data.items()):
-            data[k] = _graphml_safe_value(v)
+    H.add_nodes_from((n, {k: safe(v) for k, v in data.items()}) for n, data in G.nodes(data=True))
 
     # Edge attrs (MultiDiGraph)
-    for _, _, _, data in H.edges(keys=True, data=True):
-        for k, v in list(data.items()):
-            data[k] = _graphml_safe_value(v)
+    H.add_edges_from(
+        (u, v, key, {k: safe(x) for k, x in data.items()})
+        for u, v, key, data in G.edges(keys=True, data=True)
+    )
 
     return H
 
@@ -114,7 +188,7 @@ def load_graphml(path: Path) -> nx.MultiDiGraph:
     """Load a GraphML artifact into NetworkX.
 
     Warning: GraphML loads node ids and attribute values as strings.
-    Prefer gpickle for internal computation.
+    Prefer the Arrow artifact (:func:`load_graph_arrow`) for internal computation.
 
     :param path: Path to the GraphML file.
     :type path: Path
@@ -128,6 +202,9 @@ def load_graphml(path: Path) -> nx.MultiDiGraph:
 def save_gpickle(G: nx.Graph, path: str | Path) -> None:
     """Save a graph using Python pickle (fast, full-fidelity engine artifact).
 
+    The pickle stream uses the highest protocol and is gzip-compressed
+    (level 3: most of the size win for a fraction of the CPU of level 9).
+
     :param G: Graph to serialize.
     :type G: nx.Graph
     :param path: Destination file path.
@@ -138,13 +215,15 @@ def save_gpickle(G: nx.Graph, path: str | Path) -> None:
     """
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("wb") as f:
+    with gzip.open(path, "wb", compresslevel=3) as f:
         pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 def load_gpickle(path: str | Path) -> nx.Graph:
     """Load a graph saved by :func:`save_gpickle`.
 
+    Plain (uncompressed) pickles written by earlier versions are still accepted.
+
     :param path: Path to the gpickle file.
     :type path: str | Path
     :raises OSError: If the file cannot be read.
@@ -153,10 +232,179 @@ def load_gpickle(path: str | Path) -> nx.Graph:
     :rtype: nx.Graph
     """
     path = Path(path)
-    with path.open("rb") as f:
+    with path.open("rb") as raw:
+        is_gzip = raw.read(2) == _GZIP_MAGIC
+    opener = gzip.open if is_gzip else open
+    with opener(path, "rb") as f:
         return pickle.load(f)
 
 
+def graph_arrow_paths(path: str | Path) -> tuple[Path, Path]:
+    """Return the `(nodes, edges)` Feather file paths for an Arrow graph artifact.
+
+    :param path: Base path of the artifact (e.g. `data/processed/graph`).
+    :type path: str | Path
+    :return: `<path>.nodes.feather` and `<path>.edges.feather`.
+    :rtype: tuple[Path, Path]
+    """
+    path = Path(path)
+    return (
+        path.with_name(f"{path.name}.nodes.feather"),
+        path.with_name(f"{path.name}.edges.feather"),
+    )
+
+
+def _json_default(v: Any) -> Any:
+    """Fallback for `json.dumps`: unwrap NumPy scalars, stringify anything else."""
+    item = getattr(v, "item", None)
+    if item is not None:
+        return item()
+    return str(v)
+
+
+def _attrs_to_arrow(
+    keys: dict[str, list[Any]],
+    records: list[dict[str, Any]],
+) -> pa.Table:
+    """Build an Arrow table from key columns plus one attribute dict per row.
+
+    - Attributes missing on a row become nulls.
+    - `geometry` (Shapely) is stored as WKB bytes in `geometry_wkb`.
+    - Columns Arrow cannot type (e.g. OSMnx's str-or-list `highway`) are stored as
+      JSON strings and listed in the `json_columns` schema metadata.
+
+    :param keys: Identity columns (node id or `u`, `v`, `key`), written first.
+    :type keys: dict[str, list[Any]]
+    :param records: Attribute dicts, aligned with the key columns.
+    :type records: list[dict[str, Any]]
+    :return: Arrow table ready for Feather/Parquet.
+    :rtype: pa.Table
+    """
+    names: dict[str, None] = {}
+    for rec in records:
+        names.update(dict.fromkeys(rec))
+
+    columns: dict[str, pa.Array] = {k: pa.array(v) for k, v in keys.items()}
+    json_columns: list[str] = []
+    for name in names:
+        values = [rec.get(name) for rec in records]
+        if name == "geometry":
+            columns["geometry_wkb"] = pa.array(shapely.to_wkb(np.asarray(values, dtype=object)))
+            continue
+        try:
+            columns[name] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            columns[name] = pa.array(
+                [None if x is None else json.dumps(x, default=_json_default) for x in values],
+                type=pa.string(),
+            )
+            json_columns.append(name)
+
+    table = pa.table(columns)
+    return table.replace_schema_metadata({"json_columns": json.dumps(json_columns)})
+
+
+def _arrow_to_attrs(table: pa.Table, keys: list[str]) -> list[dict[str, Any]]:
+    """Inverse of :func:`_attrs_to_arrow`: one attribute dict per row, nulls dropped."""
+    meta = table.schema.metadata or {}
+    json_columns = set(json.loads(meta.get(b"json_columns", b"[]")))
+
+    attrs = table.drop_columns(keys)
+    columns: dict[str, list[Any]] = {}
+    for name in attrs.column_names:
+        col = attrs.column(name)
+        if name == "geometry_wkb":
+            columns["geometry"] = list(shapely.from_wkb(col.to_numpy(zero_copy_only=False)))
+        elif name in json_columns:
+            columns[name] = [None if x is None else json.loads(x) for x in col.to_pylist()]
+        else:
+            columns[name] = col.to_pylist()
+
+    if not columns:
+        return [{} for _ in range(table.num_rows)]
+
+    names = list(columns)
+    return [
+        {k: x for k, x in zip(names, row, strict=True) if x is not None}
+        for row in zip(*columns.values(), strict=True)
+    ]
+
+
+def save_graph_arrow(G: nx.MultiDiGraph, path: str | Path) -> None:
+    """Save a graph as a pair of Feather v2 tables (columnar engine artifact).
+
+    Writes `<path>.nodes.feather` (`node_id` + node attributes) and
+    `<path>.edges.feather` (`u`, `v`, `key` + edge attributes, geometry as WKB),
+    zstd-compressed. Graph-level attributes travel in the edges schema metadata.
+    Unlike pickle, loading does not replay Python object construction per edge.
+
+    :param G: Graph to serialize.
+    :type G: nx.MultiDiGraph
+    :param path: Base path of the artifact (see :func:`graph_arrow_paths`).
+    :type path: str | Path
+    :raises OSError: If the destination directory cannot be created or files cannot be written.
+    :return: None
+    :rtype: None
+    """
+    nodes_path, edges_path = graph_arrow_paths(path)
+    nodes_path.parent.mkdir(parents=True, exist_ok=True)
+
+    node_ids, node_attrs = (
+        zip(*G.nodes(data=True), strict=True) if G.number_of_nodes() else ((), ())
+    )
+    nodes = _attrs_to_arrow({"node_id": list(node_ids)}, list(node_attrs))
+
+    edge_rows = list(G.edges(keys=True, data=True))
+    us, vs, ks, edge_attrs = zip(*edge_rows, strict=True) if edge_rows else ((), (), (), ())
+    edges = _attrs_to_arrow({"u": list(us), "v": list(vs), "key": list(ks)}, list(edge_attrs))
+    edges = edges.replace_schema_metadata(
+        {
+            **edges.schema.metadata,
+            b"graph": json.dumps(
+                {k: v for k, v in G.graph.items() if not str(k).startswith("_")},
+                default=_json_default,
+            ).encode(),
+        }
+    )
+
+    feather.write_feather(nodes, nodes_path, compression="zstd")
+    feather.write_feather(edges, edges_path, compression="zstd")
+
+
+def load_graph_arrow(path: str | Path) -> nx.MultiDiGraph:
+    """Load a graph saved by :func:`save_graph_arrow`.
+
+    Nodes and edges are added in one bulk call each; attributes that were
+    missing on an element when saved stay missing (nulls are not materialized).
+
+    :param path: Base path of the artifact (see :func:`graph_arrow_paths`).
+    :type path: str | Path
+    :raises OSError: If either Feather file cannot be read.
+    :return: The reconstructed graph.
+    :rtype: nx.MultiDiGraph
+    """
+    nodes_path, edges_path = graph_arrow_paths(path)
+    nodes = feather.read_table(nodes_path)
+    edges = feather.read_table(edges_path)
+
+    G = nx.MultiDiGraph()
+    G.graph.update(json.loads((edges.schema.metadata or {}).get(b"graph", b"{}")))
+
+    G.add_nodes_from(
+        zip(nodes.column("node_id").to_pylist(), _arrow_to_attrs(nodes, ["node_id"]), strict=True)
+    )
+    G.add_edges_from(
+        zip(
+            edges.column("u").to_pylist(),
+            edges.column("v").to_pylist(),
+            edges.column("key").to_pylist(),
+            _arrow_to_attrs(edges, ["u", "v", "key"]),
+            strict=True,
+        )
+    )
+    return G
+
+
 def graph_basic_stats(G: nx.MultiDiGraph) -> dict[str, Any]:
     """Compute basic summary stats for a graph.
 
@@ -184,14 +432,17 @@ def _to_json_string(v: Any) -> str:
     :return: A string representation safe for tabular serialization.
     :rtype: str
     """
-    if v is None:
-        return ""
+    handler = _JSON_STRING.get(type(v))
+    if handler is not None:
+        return handler(v)
     # keep common scalars
     if isinstance(v, (str, int, float, bool)):
         return str(v)
     # lists/dicts/sets -> JSON
-    if isinstance(v, (list, tuple, set, dict)):
-        return json.dumps(v, ensure_ascii=False)
+    if isinstance(v, (list, tuple, set)):
+        return _json_list(v)
+    if isinstance(v, dict):
+        return _json_dict(v)
     # shapely -> WKT if present
     wkt = getattr(v, "wkt", None)
     if wkt is not None:
@@ -199,6 +450,91 @@ def _to_json_string(v: Any) -> str:
     return str(v)
 
 
+def _coords_list_arrays(geoms: np.ndarray) -> tuple[pa.ListArray, pa.ListArray]:
+    """Pack geometry vertices as two `list<double>` Arrow arrays (`lons`, `lats`).
+
+    One vectorized `get_coordinates` call; the per-geometry offsets come from a
+    bincount of the vertex -> geometry index, so no Python loop over rows.
+
+    :param geoms: Array of Shapely geometries (lon/lat order).
+    :type geoms: np.ndarray
+    :return: A tuple of (lons, lats) list arrays aligned with `geoms`.
+    :rtype: tuple[pa.ListArray, pa.ListArray]
+    """
+    coords, index = shapely.get_coordinates(geoms, return_index=True)
+    offsets = np.zeros(len(geoms) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(index, minlength=len(geoms)), out=offsets[1:])
+    return (
+        pa.ListArray.from_arrays(offsets, coords[:, 0]),
+        pa.ListArray.from_arrays(offsets, coords[:, 1]),
+    )
+
+
+def _extent_metadata(lons: np.ndarray, lats: np.ndarray) -> dict[bytes, bytes]:
+    """Map center (mean vertex) and bbox as parquet schema metadata entries."""
+    if len(lons) == 0:
+        return {}
+    bbox = [float(lons.min()), float(lats.min()), float(lons.max()), float(lats.max())]
+    return {
+        b"center_lat": str(float(lats.mean())).encode(),
+        b"center_lon": str(float(lons.mean())).encode(),
+        b"bbox": json.dumps(bbox).encode(),
+    }
+
+
+def read_edges_extent(path: str | Path) -> dict[str, Any] | None:
+    """Read the map extent stored by :func:`export_nodes_edges_parquet`.
+
+    Only the parquet footer is read, no row data.
+
+    :param path: `edges.parquet` path.
+    :type path: str | Path
+    :return: `{"center_lat", "center_lon", "bbox"}` with `bbox` as
+        `[min_lon, min_lat, max_lon, max_lat]`, or None for files exported
+        without it.
+    :rtype: dict[str, Any] | None
+    """
+    meta = pq.read_schema(path).metadata or {}
+    if b"center_lat" not in meta:
+        return None
+    return {
+        "center_lat": float(meta[b"center_lat"]),
+        "center_lon": float(meta[b"center_lon"]),
+        "bbox": json.loads(meta[b"bbox"]),
+    }
+
+
+# Edge columns OSMnx may fill with lists or mixed types; always exported as strings.
+_STRINGIFY_EDGE_COLUMNS = (
+    "highway",
+    "name",
+    "maxspeed",
+    "lanes",
+    "access",
+    "bridge",
+    "junction",
+    "ref",
+    "service",
+    "tunnel",
+    "osmid",
+)
+
+
+def _sanitized_table(df: pd.DataFrame, strings: Collection[str]) -> pa.Table:
+    """Arrow table of `df` with the `strings` columns built straight as Arrow strings.
+
+    Each listed column is converted in one pass (see :func:`_to_json_string`),
+    without writing the strings back into `df`; the other columns go through
+    `Table.from_pandas` (keeping the pandas dtype metadata).
+    """
+    table = pa.Table.from_pandas(df.drop(columns=list(strings)), preserve_index=False)
+    for i, name in enumerate(df.columns):
+        if name in strings:
+            values = pa.array([_to_json_string(v) for v in df[name].tolist()], type=pa.string())
+            table = table.add_column(i, name, values)
+    return table
+
+
 def export_nodes_edges_parquet(
     G: nx.MultiDiGraph,
     nodes_path: str | Path,
@@ -208,6 +544,10 @@ def export_nodes_edges_parquet(
 
     Uses OSMnx to convert the graph to GeoDataFrames, then:
     - Adds `geometry_wkt` columns for portability
+    - Adds packed `lons`/`lats` (`list<double>`) edge columns so readers can draw
+      edges without parsing WKT
+    - Stores the map center and bbox in the edges schema metadata
+      (see :func:`read_edges_extent`)
     - Drops shapely geometry columns
     - Normalizes object-like columns to stable strings (JSON/WKT)
     - Preserves join keys (`u`, `v`, `key`, `node_id`) as numeric types when possible
@@ -239,6 +579,9 @@ def export_nodes_edges_parquet(
     gdf_nodes["geometry_wkt"] = gdf_nodes.geometry.to_wkt()
     gdf_edges["geometry_wkt"] = gdf_edges.geometry.to_wkt()
 
+    # geometry as packed coordinate lists (zero parsing at read time)
+    edge_lons, edge_lats = _coords_list_arrays(gdf_edges.geometry.to_numpy())
+
     # drop shapely geometry columns
     gdf_nodes = gdf_nodes.drop(columns=["geometry"])
     gdf_edges = gdf_edges.drop(columns=["geometry"])
@@ -251,47 +594,45 @@ def export_nodes_edges_parquet(
     if "osmid" in nodes_df.columns:
         nodes_df["node_id"] = pd.to_numeric(nodes_df["osmid"], errors="coerce").astype("Int64")
 
-    for c in ["u", "v", "key"]:
+    for c, dtype in ID_DTYPES.items():
         if c in edges_df.columns:
-            edges_df[c] = pd.to_numeric(edges_df[c], errors="coerce").astype("Int64")
+            edges_df[c] = pd.to_numeric(edges_df[c], errors="coerce").astype(dtype)
 
     protected = {"u", "v", "key", "node_id"}  # do NOT stringify these
 
-    # Normalize: first handle known troublemakers explicitly
-    for c in [
-        "highway",
-        "name",
-        "maxspeed",
-        "lanes",
-        "access",
-        "bridge",
-        "junction",
-        "ref",
-        "service",
-        "tunnel",
-        "osmid",
-    ]:
-        if c in edges_df.columns and c not in protected:
-            edges_df[c] = edges_df[c].map(_to_json_string)
-
-    # Now normalize all remaining object/string columns except protected
-    for df in (nodes_df, edges_df):
-        cols = df.select_dtypes(include=["object", "string"]).columns
-        for c in cols:
-            if c not in protected:
-                df[c] = df[c].map(_to_json_string)
-
-    # Final safety: if any column still contains list/dict/etc, force convert it
-    def has_complex(series: pd.Series) -> bool:
-        return series.map(lambda x: isinstance(x, (list, dict, tuple, set))).any()
-
-    for df in (nodes_df, edges_df):
-        for c in df.columns:
-            if has_complex(df[c]):
-                df[c] = df[c].map(_to_json_string)
+    # Normalize: first handle known troublemakers explicitly, then all remaining
+    # object/string columns except protected; each is converted once when the
+    # Arrow tables are built below
+    edge_strings = {c for c in _STRINGIFY_EDGE_COLUMNS if c in edges_df.columns} - protected
+    node_strings: set[str] = set()
+    for df, strings in ((nodes_df, node_strings), (edges_df, edge_strings)):
+        strings.update(
+            c for c in df.select_dtypes(include=["object", "string"]).columns if c not in protected
+        )
 
-    # drop rows missing join keys (rare but safe)
-    edges_df = edges_df.dropna(subset=[c for c in ["u", "v", "key"] if c in edges_df.columns])
+    # Every other column has a numeric/bool dtype (or is a join key made numeric
+    # above), so it cannot hold lists/dicts; Arrow would reject one if it did.
 
-    nodes_df.to_parquet(nodes_path, index=False)
-    edges_df.to_parquet(edges_path, index=False)
+    # drop rows missing join keys (rare but safe)
+    keys = [c for c in ["u", "v", "key"] if c in edges_df.columns]
+    keep = edges_df[keys].notna().all(axis=1).to_numpy()
+    edges_df = edges_df[keep]
+
+    edges_table = (
+        _sanitized_table(edges_df, edge_strings)
+        .append_column("lons", edge_lons.filter(keep))
+        .append_column("lats", edge_lats.filter(keep))
+    )
+    # map extent for dashboards, so they never scan geometry to center the view
+    edges_table = edges_table.replace_schema_metadata(
+        {
+            **(edges_table.schema.metadata or {}),
+            **_extent_metadata(
+                edges_table["lons"].combine_chunks().flatten().to_numpy(),
+                edges_table["lats"].combine_chunks().flatten().to_numpy(),
+            ),
+        }
+    )
+
+    pq.write_table(_sanitized_table(nodes_df, node_strings), nodes_path, **PARQUET_OPTIONS)
+    pq.write_table(edges_table, edges_path, **PARQUET_OPTIONS)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-import math
+import re
 
 import networkx as nx
+import numpy as np
+import pandas as pd
 
 
 def _safe_float(x, default: float) -> float:
@@ -12,6 +14,38 @@ def _safe_float(x, default: float) -> float:
         return default
 
 
+def _first(x):
+    # OSMnx merges attributes of simplified edges into lists; use the first value
+    return x[0] if isinstance(x, list) and x else x
+
+
+# everything but digits and dots, stripped from maxspeed tags ("50 mph" -> "50")
+_NON_SPEED_RE = re.compile(r"[^\d.]+")
+
+
+def _parse_speed(maxspeed, default_speed_kph: float) -> float:
+    if isinstance(maxspeed, str):
+        # keep digits
+        return _safe_float(_NON_SPEED_RE.sub("", maxspeed), default_speed_kph)
+    return _safe_float(maxspeed, default_speed_kph)
+
+
+def _parsed_column(raw: list, parse) -> np.ndarray:
+    """`parse` applied to every value of `raw`, once per distinct value (OSM tags repeat a lot)."""
+    cache: dict = {}
+    out = np.empty(len(raw), dtype=np.float64)
+    for i, x in enumerate(raw):
+        try:
+            v = cache.get(x)
+        except TypeError:  # unhashable tag value
+            out[i] = parse(x)
+            continue
+        if v is None:
+            v = cache[x] = parse(x)
+        out[i] = v
+    return out
+
+
 def add_freeflow_time_and_capacity(
     G: nx.MultiDiGraph,
     default_speed_kph: float = 40.0,
@@ -28,39 +62,36 @@ def add_freeflow_time_and_capacity(
       - maxspeed (kph)
       - lanes
 
+    `maxspeed`/`lanes` tags are parsed once per distinct value and `length` is
+    converted in one vectorized call; the arithmetic runs on whole NumPy arrays.
+
     Notes:
       - Capacity is a proxy in this prototype; refine with local counts later.
     """
-
-    for _, _, _, data in G.edges(keys=True, data=True):
-        length_m = _safe_float(data.get("length"), 50.0)
-
-        # maxspeed can be list/str; try to parse
-        maxspeed = data.get("maxspeed")
-        if isinstance(maxspeed, list) and maxspeed:
-            maxspeed = maxspeed[0]
-        if isinstance(maxspeed, str):
-            # keep digits
-            digits = "".join(ch for ch in maxspeed if ch.isdigit() or ch == ".")
-            speed_kph = _safe_float(digits, default_speed_kph)
-        else:
-            speed_kph = _safe_float(maxspeed, default_speed_kph)
-
-        speed_kph = max(5.0, speed_kph)
-        speed_mps = speed_kph * 1000.0 / 3600.0
-        t0 = length_m / speed_mps
-
-        lanes = data.get("lanes")
-        if isinstance(lanes, list) and lanes:
-            lanes = lanes[0]
-        lanes_f = max(1.0, _safe_float(lanes, 1.0))
-
-        # Very rough: capacity per lane per hour
-        capacity = default_capacity_vph * lanes_f
-
-        data["t0"] = float(t0)
-        data["capacity"] = float(capacity)
+    edge_data = [d for *_, d in G.edges(keys=True, data=True)]
+
+    # lengths are nearly all distinct floats: one vectorized conversion, no per-value cache
+    lengths = pd.Series([d.get("length") for d in edge_data], dtype=object)
+    length_m = pd.to_numeric(lengths, errors="coerce").fillna(50.0).to_numpy(dtype=np.float64)
+    # maxspeed can be list/str; try to parse
+    speed_kph = _parsed_column(
+        [_first(d.get("maxspeed")) for d in edge_data], lambda x: _parse_speed(x, default_speed_kph)
+    )
+    lanes = _parsed_column(
+        [_first(d.get("lanes")) for d in edge_data], lambda x: _safe_float(x, 1.0)
+    )
+
+    # fmax: NaN speeds / lanes fall back to the floor, like the builtin max
+    speed_mps = np.fmax(speed_kph, 5.0) * 1000.0 / 3600.0
+    t0 = length_m / speed_mps
+
+    # Very rough: capacity per lane per hour
+    capacity = default_capacity_vph * np.fmax(lanes, 1.0)
+
+    for data, t, cap in zip(edge_data, t0.tolist(), capacity.tolist(), strict=True):
+        data["t0"] = t
+        data["capacity"] = cap
         data.setdefault("flow", 0.0)
-        data.setdefault("time", float(t0))
+        data.setdefault("time", t)
 
     return G
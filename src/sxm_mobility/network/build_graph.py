@@ -1,16 +1,47 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from pathlib import Path
-import osmnx as ox
+
 import networkx as nx
+import osmnx as ox
+from loguru import logger
+
+from sxm_mobility.io.osm_ingest import graph_arrow_paths, load_graph_arrow, save_graph_arrow
+
 
+def graph_cache_path(cache_dir: str | Path, place_query: str, network_type: str) -> Path:
+    """Base path of the cached graph for a query (see :func:`build_graph`).
 
+    The key hashes the query, the network type and the osmnx version, so an
+    osmnx upgrade (different download/simplification) never reuses a stale graph.
 
-def build_graph(place_query: str, network_type: str = "drive") -> nx.MultiDiGraph:
+    :return: Artifact base path; the files are its :func:`graph_arrow_paths`.
+    :rtype: Path
+    """
+    key = json.dumps([place_query, network_type, ox.__version__])
+    return Path(cache_dir) / f"graph-{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+
+
+def build_graph(
+    place_query: str, network_type: str = "drive", cache_dir: str | Path | None = None
+) -> nx.MultiDiGraph:
     """
     Build and return an OSM road network graph (no saving here).
     Saving/exporting is handled by scripts/build_graph.py.
+
+    With `cache_dir`, the built graph is memoized there as an Arrow artifact
+    (:func:`graph_cache_path`), so later calls for the same query skip the
+    Overpass download and simplification. Every call returns a fresh graph.
     """
+    cache_path = (
+        None if cache_dir is None else graph_cache_path(cache_dir, place_query, network_type)
+    )
+    if cache_path is not None and all(p.exists() for p in graph_arrow_paths(cache_path)):
+        logger.info(f"Loading cached graph: {cache_path}")
+        return load_graph_arrow(cache_path)
+
     G = ox.graph_from_place(place_query, network_type=network_type, simplify=True)
 
     # Optional (recommended): keep largest strongly connected component for drive networks
@@ -20,4 +51,6 @@ def build_graph(place_query: str, network_type: str = "drive") -> nx.MultiDiGrap
     except Exception:
         pass
 
-    return G
\ No newline at end of file
+    if cache_path is not None:
+        save_graph_arrow(G, cache_path)
+    return G
@@ -4,9 +4,17 @@ import networkx as nx
 
 
 def largest_weakly_connected_component(G: nx.MultiDiGraph) -> nx.MultiDiGraph:
-    """Keep only the largest weakly connected component."""
+    """Keep only the largest weakly connected component.
+
+    Copies `G` directly and drops the nodes outside the component, rather than
+    copying through a subgraph view (whose filtered adjacency makes every edge
+    lookup slower); the node and edge order are the same.
+    """
     if G.number_of_nodes() == 0:
         return G
 
     comp = max(nx.weakly_connected_components(G), key=len)
-    return G.subgraph(comp).copy()
+    H = G.copy()
+    if len(comp) < H.number_of_nodes():
+        H.remove_nodes_from([n for n in G if n not in comp])
+    return H
@@ -1,67 +1,253 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from functools import cached_property
+from typing import Any
 
 import networkx as nx
 
+from sxm_mobility.assignment.msa import EdgeKey
+from sxm_mobility.assignment.soa import invalidate_soa, restore_soa
+
+
+@dataclass(frozen=True)
+class EdgeOverlay:
+    """Copy-on-write view of a scenario on top of a shared base graph.
+
+    `overrides` replaces edge attributes and `excluded` edges are hidden from
+    routing; both are consumed by `msa_edge_state` so the base is never copied.
+    `added` lists new `(u, v, attrs)` edges: those change the topology, so they
+    are added to the live graph for the duration of a run (:meth:`applied`).
+    """
+
+    overrides: dict[EdgeKey, dict[str, float]] = field(default_factory=dict)
+    excluded: frozenset[EdgeKey] = frozenset()
+    added: tuple[tuple[Any, Any, dict[str, Any]], ...] = ()
+
+    @contextmanager
+    def applied(self, G: nx.MultiDiGraph) -> Iterator[nx.MultiDiGraph]:
+        """Add the `added` edges to `G` in place and remove them again on exit.
+
+        New edges are appended to the adjacency, so removing them (and any
+        nodes they created) restores `G` exactly, without copying the whole
+        graph. `overrides` and `excluded` are not written: pass them to the
+        assignment as usual. The base arrays cached on `G`
+        (:func:`~sxm_mobility.assignment.soa.build_or_get_soa`) are put back on
+        exit. `G` must not be read concurrently while the overlay is applied.
+
+        :param G: Graph to modify temporarily.
+        :type G: nx.MultiDiGraph
+        :return: `G` itself, with the added edges.
+        :rtype: Iterator[nx.MultiDiGraph]
+        """
+        cached = invalidate_soa(G)
+        added_edges: list[EdgeKey] = []
+        added_nodes: list[Any] = []
+        try:
+            for u, v, attrs in self.added:
+                added_nodes.extend(n for n in dict.fromkeys((u, v)) if n not in G)
+                added_edges.append((u, v, G.add_edge(u, v, **attrs)))
+            yield G
+        finally:
+            G.remove_edges_from(reversed(added_edges))
+            G.remove_nodes_from(added_nodes)
+            restore_soa(G, cached)
+
+
+def _target(G: nx.MultiDiGraph, mutate: bool) -> nx.MultiDiGraph:
+    """Graph a :meth:`Scenario.apply` writes to: a copy, or `G` with its base arrays dropped."""
+    if not mutate:
+        return G.copy()
+    invalidate_soa(G)
+    return G
+
+
+@dataclass(frozen=True)
+class RestoreToken:
+    """Undo record of :meth:`Scenario.apply_inplace`, consumed by :meth:`Scenario.restore`.
+
+    `edge` is the touched edge (None when the scenario did not apply), `data`
+    its previous attributes or removed data dict, `nodes` the nodes it created
+    and `soa` the base-array cache entry of the graph before the change.
+    """
+
+    edge: EdgeKey | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    nodes: tuple[Any, ...] = ()
+    soa: tuple | None = None
+
 
 @dataclass(frozen=True)
 class Scenario:
     name: str
     description: str
 
-    def apply(self, G: nx.MultiDiGraph) -> nx.MultiDiGraph:  # pragma: no cover
+    @cached_property
+    def _field_values(self) -> dict[str, Any]:
+        # scenarios are frozen, so their fields are read once per instance
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Fields of the scenario as a new dict, like :func:`dataclasses.asdict`.
+
+        :return: Field name to value.
+        :rtype: dict[str, Any]
+        """
+        return dict(self._field_values)
+
+    def apply(  # pragma: no cover
+        self, G: nx.MultiDiGraph, mutate: bool = False
+    ) -> nx.MultiDiGraph:
+        """Graph with the scenario applied.
+
+        :param G: Base graph.
+        :type G: nx.MultiDiGraph
+        :param mutate: Change `G` itself instead of a copy, for callers that own
+            `G` and do not need the original; defaults to False.
+        :type mutate: bool, optional
+        :return: The changed graph (`G` itself when `mutate`).
+        :rtype: nx.MultiDiGraph
+        """
         raise NotImplementedError
 
+    def apply_inplace(self, G: nx.MultiDiGraph) -> RestoreToken:  # pragma: no cover
+        """Apply the scenario to `G` itself; :meth:`restore` with the token undoes it.
+
+        For search loops that probe many scenarios on one graph: the change and
+        its undo touch a single edge instead of copying `G`.
+        """
+        raise NotImplementedError
+
+    def restore(self, G: nx.MultiDiGraph, token: RestoreToken) -> None:  # pragma: no cover
+        """Undo :meth:`apply_inplace` on `G`."""
+        raise NotImplementedError
+
+    def overlay(self, G: nx.MultiDiGraph) -> EdgeOverlay | None:
+        """Express the scenario as an :class:`EdgeOverlay` on `G`.
+
+        Returns None when the change cannot be expressed as attribute overrides,
+        hidden edges or added edges; callers then fall back to :meth:`apply`.
+        """
+        return None
+
 
 @dataclass(frozen=True)
 class IncreaseCapacity(Scenario):
-    u: str
-    v: str
+    u: Any
+    v: Any
     key: int
     pct: float = 0.25
 
-    def apply(self, G: nx.MultiDiGraph) -> nx.MultiDiGraph:
-        H = G.copy()
+    def apply(self, G: nx.MultiDiGraph, mutate: bool = False) -> nx.MultiDiGraph:
+        H = _target(G, mutate)
         if H.has_edge(self.u, self.v, self.key):
             cap = float(H[self.u][self.v][self.key].get("capacity", 0.0))
             H[self.u][self.v][self.key]["capacity"] = cap * (1.0 + self.pct)
         return H
 
+    def apply_inplace(self, G: nx.MultiDiGraph) -> RestoreToken:
+        if not G.has_edge(self.u, self.v, self.key):
+            return RestoreToken()
+        data = G[self.u][self.v][self.key]
+        token = RestoreToken(
+            edge=(self.u, self.v, self.key),
+            data={"capacity": data["capacity"]} if "capacity" in data else {},
+            soa=invalidate_soa(G),
+        )
+        data["capacity"] = float(data.get("capacity", 0.0)) * (1.0 + self.pct)
+        return token
+
+    def restore(self, G: nx.MultiDiGraph, token: RestoreToken) -> None:
+        if token.edge is None:
+            return
+        data = G.edges[token.edge]
+        data.pop("capacity", None)
+        data.update(token.data)
+        restore_soa(G, token.soa)
+
+    def overlay(self, G: nx.MultiDiGraph) -> EdgeOverlay:
+        if not G.has_edge(self.u, self.v, self.key):
+            return EdgeOverlay()
+        cap = float(G[self.u][self.v][self.key].get("capacity", 0.0))
+        return EdgeOverlay(
+            overrides={(self.u, self.v, self.key): {"capacity": cap * (1.0 + self.pct)}}
+        )
+
 
 @dataclass(frozen=True)
 class AddConnector(Scenario):
-    u: str
-    v: str
+    u: Any
+    v: Any
     length_m: float
     speed_kph: float = 40.0
     capacity_vph: float = 900.0
 
-    def apply(self, G: nx.MultiDiGraph) -> nx.MultiDiGraph:
-        H = G.copy()
-        speed_mps = self.speed_kph * 1000.0 / 3600.0
-        t0 = self.length_m / speed_mps
-        H.add_edge(
-            self.u,
-            self.v,
-            length=self.length_m,
-            t0=float(t0),
-            time=float(t0),
-            capacity=float(self.capacity_vph),
-            flow=0.0,
-            scenario_edge=True,
-        )
+    @cached_property
+    def _edge_attrs(self) -> dict[str, Any]:
+        # the fields are frozen, so the connector's attributes are computed once
+        t0 = float(self.length_m / (self.speed_kph * 1000.0 / 3600.0))
+        return {
+            "length": self.length_m,
+            "t0": t0,
+            "time": t0,
+            "capacity": float(self.capacity_vph),
+            "flow": 0.0,
+            "scenario_edge": True,
+        }
+
+    def apply(self, G: nx.MultiDiGraph, mutate: bool = False) -> nx.MultiDiGraph:
+        H = _target(G, mutate)
+        H.add_edge(self.u, self.v, **self._edge_attrs)
         return H
 
+    def overlay(self, G: nx.MultiDiGraph) -> EdgeOverlay:
+        attrs = dict(self._edge_attrs)
+        return EdgeOverlay(added=((self.u, self.v, attrs),))
+
+    def apply_inplace(self, G: nx.MultiDiGraph) -> RestoreToken:
+        ((u, v, attrs),) = self.overlay(G).added
+        nodes = tuple(n for n in dict.fromkeys((u, v)) if n not in G)
+        soa = invalidate_soa(G)
+        return RestoreToken(edge=(u, v, G.add_edge(u, v, **attrs)), nodes=nodes, soa=soa)
+
+    def restore(self, G: nx.MultiDiGraph, token: RestoreToken) -> None:
+        G.remove_edge(*token.edge)
+        G.remove_nodes_from(token.nodes)
+        restore_soa(G, token.soa)
+
 
 @dataclass(frozen=True)
 class Closure(Scenario):
-    u: str
-    v: str
+    u: Any
+    v: Any
     key: int
 
-    def apply(self, G: nx.MultiDiGraph) -> nx.MultiDiGraph:
-        H = G.copy()
+    def apply(self, G: nx.MultiDiGraph, mutate: bool = False) -> nx.MultiDiGraph:
+        H = _target(G, mutate)
         if H.has_edge(self.u, self.v, self.key):
             H.remove_edge(self.u, self.v, self.key)
         return H
+
+    def apply_inplace(self, G: nx.MultiDiGraph) -> RestoreToken:
+        if not G.has_edge(self.u, self.v, self.key):
+            return RestoreToken()
+        data = G[self.u][self.v][self.key]
+        soa = invalidate_soa(G)
+        G.remove_edge(self.u, self.v, self.key)
+        return RestoreToken(edge=(self.u, self.v, self.key), data=data, soa=soa)
+
+    def restore(self, G: nx.MultiDiGraph, token: RestoreToken) -> None:
+        """Re-add the closed edge with its original data.
+
+        The edge goes back at the end of its node's adjacency, so routing
+        tie-breaks between equal-time paths may differ from before.
+        """
+        if token.edge is None:
+            return
+        G.add_edge(*token.edge, **token.data)
+        restore_soa(G, token.soa)
+
+    def overlay(self, G: nx.MultiDiGraph) -> EdgeOverlay:
+        return EdgeOverlay(excluded=frozenset({(self.u, self.v, self.key)}))
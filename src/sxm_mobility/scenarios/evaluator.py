@@ -2,11 +2,10 @@ from __future__ import annotations
 
 import networkx as nx
 
-from sxm_mobility.assignment.metrics import total_delay, total_system_travel_time
+from sxm_mobility.assignment.metrics import tstt_and_delay
+from sxm_mobility.assignment.soa import EdgeArrays, EdgeState
 
 
-def score_graph(G: nx.MultiDiGraph) -> dict[str, float]:
-    return {
-        "tstt": total_system_travel_time(G),
-        "delay": total_delay(G),
-    }
+def score_graph(G: nx.MultiDiGraph | EdgeState | EdgeArrays) -> dict[str, float]:
+    tstt, delay = tstt_and_delay(G)
+    return {"tstt": tstt, "delay": delay}
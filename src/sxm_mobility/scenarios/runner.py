@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+import multiprocessing
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 import networkx as nx
 
-from sxm_mobility.assignment.msa import msa_traffic_assignment
+from sxm_mobility.assignment.msa import msa_edge_arrays, msa_traffic_assignment
+from sxm_mobility.assignment.routing import RoutingIndex, build_routing_index
 from sxm_mobility.scenarios.evaluator import score_graph
 
 
@@ -15,8 +20,113 @@ def run_scenario(
     iters: int,
     alpha: float,
     beta: float,
+    index: RoutingIndex | None = None,
+    rel_gap_tol: float = 0.0,
+    dtype: str = "float64",
 ) -> dict:
-    H = scenario.apply(base_graph)
-    H = msa_traffic_assignment(H, od=od, iters=iters, alpha=alpha, beta=beta)
-    scores = score_graph(H)
-    return {"scenario": asdict(scenario), "scores": scores}
+    """Assign `od` under `scenario` and score the result.
+
+    Scenarios that can be expressed as an overlay (attribute overrides / closed
+    edges) run directly on `base_graph`, which is left untouched. Overlays that
+    add edges add them to `base_graph` in place for the run and remove them
+    afterwards (:meth:`EdgeOverlay.applied`); other scenarios are applied to a copy.
+
+    `index` is a :class:`RoutingIndex` of `base_graph`, reused by overlay runs so
+    a sweep builds it once. `rel_gap_tol` and `dtype` are passed to the
+    assignment (see :func:`~sxm_mobility.assignment.msa.msa_edge_arrays`).
+    """
+    overlay = scenario.overlay(base_graph)
+    if overlay is not None and overlay.added:
+        # new links change the topology (so `index` does not apply): add them to
+        # `base_graph` for this run only, instead of copying it
+        with overlay.applied(base_graph) as H:
+            arrays = msa_edge_arrays(
+                H,
+                od=od,
+                iters=iters,
+                alpha=alpha,
+                beta=beta,
+                overrides=overlay.overrides,
+                excluded=overlay.excluded,
+                rel_gap_tol=rel_gap_tol,
+                dtype=dtype,
+            )
+        scores = score_graph(arrays)
+    elif overlay is None:
+        H = scenario.apply(base_graph)
+        H = msa_traffic_assignment(
+            H, od=od, iters=iters, alpha=alpha, beta=beta, rel_gap_tol=rel_gap_tol, dtype=dtype
+        )
+        scores = score_graph(H)
+    else:
+        arrays = msa_edge_arrays(
+            base_graph,
+            od=od,
+            iters=iters,
+            alpha=alpha,
+            beta=beta,
+            overrides=overlay.overrides,
+            excluded=overlay.excluded,
+            index=index,
+            rel_gap_tol=rel_gap_tol,
+            dtype=dtype,
+        )
+        scores = score_graph(arrays)
+    return {"scenario": scenario.as_dict(), "scores": scores}
+
+
+# Base graph and routing index of a `run_scenarios` worker process, set once by `_init_base`
+_worker_base: tuple[nx.MultiDiGraph, RoutingIndex] | None = None
+
+
+def _init_base(G: nx.MultiDiGraph) -> None:
+    global _worker_base
+    _worker_base = (G, build_routing_index(G))
+
+
+def _run_on_worker_base(scenario, **kwargs) -> dict:
+    G, index = _worker_base
+    return run_scenario(G, scenario=scenario, index=index, **kwargs)
+
+
+def run_scenarios(
+    base_graph: nx.MultiDiGraph,
+    od: list[tuple[str, str, float]],
+    scenarios: Sequence,
+    iters: int,
+    alpha: float,
+    beta: float,
+    n_workers: int | None = None,
+    index: RoutingIndex | None = None,
+    rel_gap_tol: float = 0.0,
+    dtype: str = "float64",
+) -> list[dict]:
+    """:func:`run_scenario` for each of `scenarios`, fanned out over worker processes.
+
+    The base graph is pickled to each worker once, through the pool
+    initializer, and each worker builds its own routing index; tasks then only
+    carry the scenario. Workers are spawned rather than forked.
+
+    :param n_workers: Worker processes, defaults to one per CPU (capped at the
+        number of scenarios). With a single worker the sweep runs in this
+        process, on `base_graph` and `index`.
+    :type n_workers: int | None, optional
+    :return: The results in the order of `scenarios`.
+    :rtype: list[dict]
+    """
+    kwargs = dict(od=od, iters=iters, alpha=alpha, beta=beta, rel_gap_tol=rel_gap_tol, dtype=dtype)
+    n_workers = max(1, min(len(scenarios), n_workers or os.cpu_count() or 1))
+    if n_workers == 1:
+        if index is None:
+            index = build_routing_index(base_graph)
+        return [run_scenario(base_graph, scenario=s, index=index, **kwargs) for s in scenarios]
+
+    # spawn, not fork: numba's threading layer may already run in this process,
+    # and forking a multi-threaded process can deadlock
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_base,
+        initargs=(base_graph,),
+    ) as ex:
+        return list(ex.map(partial(_run_on_worker_base, **kwargs), scenarios))
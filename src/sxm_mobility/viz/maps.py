@@ -2,9 +2,36 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
+from sxm_mobility.io.osm_ingest import PARQUET_OPTIONS
 
-def save_bottlenecks_csv(rows: list[dict], path: Path) -> None:
+
+def save_bottlenecks(rows: list[dict], path: Path) -> None:
+    """Write bottleneck rows (e.g. from `top_bottlenecks`) to `path`.
+
+    The rows go straight into an Arrow table, without a pandas DataFrame:
+    `.parquet` files are written with :data:`PARQUET_OPTIONS` (zstd), any other
+    suffix as CSV by pyarrow's writer.
+
+    :param rows: One dict per edge, all with the same keys.
+    :type rows: list[dict]
+    :param path: Destination file path.
+    :type path: Path
+    :raises OSError: If the destination directory cannot be created or file cannot be written.
+    :return: None
+    :rtype: None
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    pd.DataFrame(rows).to_csv(path, index=False)
+    table = pa.Table.from_pylist(rows)
+    if path.suffix == ".parquet":
+        pq.write_table(table, path, **PARQUET_OPTIONS)
+    else:
+        pacsv.write_csv(table, path)
+
+
+def save_bottlenecks_csv(rows: list[dict], path: Path) -> None:
+    """Write bottleneck rows as CSV (see :func:`save_bottlenecks`)."""
+    save_bottlenecks(rows, path.with_suffix(".csv") if path.suffix == ".parquet" else path)
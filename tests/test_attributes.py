@@ -0,0 +1,25 @@
+import math
+
+import networkx as nx
+import pytest
+
+from sxm_mobility.network.attributes import add_freeflow_time_and_capacity
+
+
+def test_add_freeflow_time_and_capacity_parses_osm_tags():
+    G = nx.MultiDiGraph()
+    G.add_edge(1, 2, length=1000.0, maxspeed="36 mph", lanes=["2", "3"])
+    G.add_edge(1, 2, length="500", maxspeed=["72", "50"], lanes="2;3")
+    G.add_edge(2, 3, maxspeed=1.0, lanes=float("nan"), flow=5.0, time=9.0)
+    G.add_edge(3, 1, length=360.0, maxspeed="none")
+
+    add_freeflow_time_and_capacity(G, default_speed_kph=36.0, default_capacity_vph=900.0)
+
+    assert G[1][2][0]["t0"] == pytest.approx(100.0) and G[1][2][0]["capacity"] == 1800.0
+    assert G[1][2][1]["t0"] == pytest.approx(25.0) and G[1][2][1]["capacity"] == 900.0
+    # missing length -> 50 m; speeds are floored at 5 kph
+    assert G[2][3][0]["t0"] == pytest.approx(36.0) and G[2][3][0]["capacity"] == 900.0
+    assert (G[2][3][0]["flow"], G[2][3][0]["time"]) == (5.0, 9.0)
+    assert G[3][1][0]["t0"] == pytest.approx(36.0)
+    assert G[3][1][0]["time"] == G[3][1][0]["t0"] and G[3][1][0]["flow"] == 0.0
+    assert not any(math.isnan(d["t0"]) for *_, d in G.edges(keys=True, data=True))
@@ -1,4 +1,8 @@
-from sxm_mobility.assignment.bpr import bpr_time
+import numpy as np
+import pytest
+
+from sxm_mobility.assignment._kernels import bpr_update
+from sxm_mobility.assignment.bpr import bpr_time, bpr_times
 
 
 def test_bpr_time_monotonic_in_flow():
@@ -8,3 +12,35 @@ def test_bpr_time_monotonic_in_flow():
     t2 = bpr_time(t0, flow=50.0, capacity=cap)
     t3 = bpr_time(t0, flow=200.0, capacity=cap)
     assert t1 <= t2 <= t3
+
+
+def test_bpr_times_matches_scalar_bpr_time():
+    t0 = np.array([10.0, 10.0, 5.0, 7.0])
+    flow = np.array([0.0, 150.0, 20.0, 30.0])
+    cap = np.array([100.0, 100.0, 0.0, 40.0])
+    expected = [bpr_time(a, flow=f, capacity=c) for a, f, c in zip(t0, flow, cap)]
+    np.testing.assert_allclose(bpr_times(t0, flow, cap), expected)
+
+
+def test_bpr_update_matches_bpr_times():
+    t0 = np.array([10.0, 10.0, 5.0, 7.0])
+    flow = np.array([0.0, 150.0, 20.0, 30.0])
+    cap = np.array([100.0, 100.0, 0.0, 40.0])
+    time = np.empty(4)
+    bpr_update(t0, cap, flow, time, alpha=0.15, beta=4.0)
+    np.testing.assert_allclose(time, bpr_times(t0, flow, cap), rtol=1e-12)
+
+
+@pytest.mark.parametrize("beta", [4.0, 2.5, 1.0])
+def test_bpr_exponent_fast_path_matches_scalar(beta):
+    t0 = np.array([10.0, 10.0, 5.0, 7.0])
+    flow = np.array([0.0, 150.0, 20.0, 30.0])
+    cap = np.array([100.0, 100.0, 0.0, 40.0])
+    expected = [
+        bpr_time(a, flow=f, capacity=c, alpha=0.5, beta=beta)
+        for a, f, c in zip(t0, flow, cap, strict=True)
+    ]
+    time = np.empty(4)
+    bpr_update(t0, cap, flow, time, alpha=0.5, beta=beta)
+    np.testing.assert_allclose(bpr_times(t0, flow, cap, alpha=0.5, beta=beta), expected, rtol=1e-12)
+    np.testing.assert_allclose(time, expected, rtol=1e-12)
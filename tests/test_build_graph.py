@@ -0,0 +1,36 @@
+import networkx as nx
+
+from sxm_mobility.network import build_graph as build_graph_module
+from sxm_mobility.network.build_graph import build_graph, graph_cache_path
+
+
+def test_build_graph_memoizes_downloads_on_disk(tmp_path, monkeypatch):
+    downloads = []
+
+    def graph_from_place(place_query, network_type, simplify):
+        downloads.append((place_query, network_type))
+        G = nx.MultiDiGraph(crs="epsg:4326")
+        G.add_node(1, x=-63.1, y=18.0)
+        G.add_node(2, x=-63.2, y=18.1)
+        G.add_edge(1, 2, length=10.0, highway="primary")
+        G.add_edge(2, 1, length=10.0, highway="primary")
+        return G
+
+    monkeypatch.setattr(build_graph_module.ox, "graph_from_place", graph_from_place)
+
+    G = build_graph("Sint Maarten", cache_dir=tmp_path)
+    H = build_graph("Sint Maarten", cache_dir=tmp_path)
+    build_graph("Sint Maarten", network_type="walk", cache_dir=tmp_path)
+    build_graph("Sint Maarten")
+
+    assert downloads == [
+        ("Sint Maarten", "drive"),
+        ("Sint Maarten", "walk"),
+        ("Sint Maarten", "drive"),
+    ]
+    assert H is not G
+    assert list(H.nodes(data=True)) == list(G.nodes(data=True))
+    assert list(H.edges(keys=True, data=True)) == list(G.edges(keys=True, data=True))
+    assert graph_cache_path(tmp_path, "Sint Maarten", "drive") != graph_cache_path(
+        tmp_path, "Sint Maarten", "walk"
+    )
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+from sxm_mobility.config import Settings
+
+
+def test_settings_from_env_parses_field_types():
+    s = Settings.from_env(
+        {
+            "SXM_MSA_ITERS": "50",
+            "SXM_BPR_ALPHA": "0.2",
+            "SXM_DATA_DIR": "/tmp/sxm",
+            "SXM_MSA_DTYPE": "float32",
+            "SXM_SCENARIO_WORKERS": "none",
+            "OTHER": "ignored",
+        }
+    )
+
+    assert (s.msa_iters, s.bpr_alpha, s.data_dir, s.msa_dtype) == (
+        50,
+        0.2,
+        Path("/tmp/sxm"),
+        "float32",
+    )
+    assert s.scenario_workers is None
+    assert Settings.from_env({"SXM_SCENARIO_WORKERS": "4"}).scenario_workers == 4
+    assert Settings.from_env({}) == Settings()
+
+
+def test_settings_from_env_rejects_bad_values():
+    with pytest.raises(ValueError, match="SXM_MSA_DTYPE"):
+        Settings.from_env({"SXM_MSA_DTYPE": "float16"})
+    with pytest.raises(ValueError, match="SXM_MSA_ITERS"):
+        Settings.from_env({"SXM_MSA_ITERS": "many"})
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from sxm_mobility.viz.maps import save_bottlenecks
+
+
+def test_save_bottlenecks_writes_parquet_and_csv(tmp_path):
+    rows = [
+        {"u": "1", "v": "2", "key": 0, "flow": 10.0, "capacity": 900.0, "v_c": 0.011, "delay": 2.5},
+        {"u": "2", "v": "3", "key": 1, "flow": 0.0, "capacity": 0.0, "v_c": 0.0, "delay": 0.0},
+    ]
+
+    save_bottlenecks(rows, tmp_path / "out" / "b.parquet")
+    save_bottlenecks(rows, tmp_path / "out" / "b.csv")
+
+    expected = pd.DataFrame(rows)
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "out" / "b.parquet"), expected)
+    # pyarrow writes whole floats without ".0", so CSV readers may infer ints
+    csv = pd.read_csv(tmp_path / "out" / "b.csv", dtype={"u": str, "v": str})
+    pd.testing.assert_frame_equal(csv, expected, check_dtype=False)
@@ -1,9 +1,58 @@
 import networkx as nx
+import numpy as np
 
-from sxm_mobility.assignment.metrics import total_delay
+from sxm_mobility.assignment.metrics import (
+    top_bottlenecks,
+    total_delay,
+    total_system_travel_time,
+    tstt_and_delay,
+)
+from sxm_mobility.assignment.soa import EdgeArrays
 
 
 def test_total_delay_non_negative_for_reasonable_inputs():
     G = nx.MultiDiGraph()
     G.add_edge("a", "b", t0=10.0, time=12.0, flow=100.0)
     assert total_delay(G) >= 0.0
+
+
+def test_totals_match_between_graph_and_edge_arrays():
+    G = nx.MultiDiGraph()
+    G.add_edge("a", "b", t0=10.0, time=12.0, flow=100.0, capacity=50.0)
+    G.add_edge("b", "c", time=3.0, flow=20.0)
+    arrays = EdgeArrays.from_graph(G)
+    arrays.time = np.array([12.0, 3.0])
+
+    assert total_system_travel_time(arrays) == total_system_travel_time(G)
+    assert total_delay(arrays) == total_delay(G) == 200.0
+    for state in (G, arrays):
+        assert tstt_and_delay(state) == (total_system_travel_time(state), total_delay(state))
+
+
+def test_top_bottlenecks_matches_a_full_sort():
+    rng = np.random.default_rng(0)
+    G = nx.MultiDiGraph()
+    for i in range(40):
+        # few distinct values, so delays and v/c tie often
+        t0 = float(rng.integers(1, 3))
+        G.add_edge(
+            i,
+            i + 1,
+            t0=t0,
+            time=t0 + float(rng.integers(0, 3)),
+            flow=float(rng.integers(0, 4)),
+            capacity=float(rng.choice([0.0, 2.0, 4.0])),
+        )
+
+    rows = []
+    for u, v, k, d in G.edges(keys=True, data=True):
+        vc = d["flow"] / d["capacity"] if d["capacity"] > 0 else 0.0
+        rows.append((str(u), str(v), k, d["flow"] * (d["time"] - d["t0"]), vc))
+    # stable sort: ties keep edge order
+    rows.sort(key=lambda r: (-r[3], -r[4]))
+
+    for n in (1, 5, 17, 40, 100):
+        top = top_bottlenecks(G, n=n)
+        assert [(r["u"], r["v"], r["key"], r["delay"], r["v_c"]) for r in top] == rows[:n]
+        frame = top_bottlenecks(G, n=n, as_frame=True)
+        assert frame["u"].tolist() == [r[0] for r in rows[:n]]
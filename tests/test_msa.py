@@ -0,0 +1,138 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from sxm_mobility.assignment import msa
+from sxm_mobility.assignment._kernels import accumulate_flows
+from sxm_mobility.assignment.msa import msa_edge_state
+from sxm_mobility.assignment.soa import EdgeArrays, build_or_get_soa, load_soa, save_soa
+
+
+def test_adaptive_step_reaches_equilibrium_on_parallel_routes():
+    G = nx.MultiDiGraph()
+    G.add_edge("a", "b", t0=10.0, capacity=100.0)
+    G.add_edge("a", "b", t0=12.0, capacity=100.0)
+    od = [("a", "b", 300.0)]
+
+    state = msa_edge_state(G, od, iters=50, step_size="adaptive")
+
+    t1, t2 = state[("a", "b", 0)]["time"], state[("a", "b", 1)]["time"]
+    assert abs(t1 - t2) / t1 < 1e-2
+    assert abs(sum(s["flow"] for s in state.values()) - 300.0) < 1e-6
+
+
+@pytest.mark.parametrize("compiled", [True, False])
+def test_self_regulated_step_shrinks_faster_while_residual_grows(monkeypatch, compiled):
+    if compiled:
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(msa, "HAVE_NUMBA", False)
+    G = nx.MultiDiGraph()
+    G.add_edge("a", "b", t0=10.0, capacity=100.0)
+    G.add_edge("a", "b", t0=12.0, capacity=100.0)
+    od = [("a", "b", 300.0)]
+
+    # iteration 1 flips all demand to the second edge, so the residual grows:
+    # the classic step halves the flow (1/2), the self-regulated one keeps 2/3 (step 1/(1+2))
+    assert msa_edge_state(G, od, iters=2, step_size="msa")[("a", "b", 0)]["flow"] == pytest.approx(
+        150.0
+    )
+    assert msa_edge_state(G, od, iters=2)[("a", "b", 0)]["flow"] == pytest.approx(200.0)
+
+    def gap(state):
+        t1, t2 = state[("a", "b", 0)]["time"], state[("a", "b", 1)]["time"]
+        return abs(t1 - t2) / t1
+
+    self_regulated = msa_edge_state(G, od, iters=30)
+    assert gap(self_regulated) < 1e-2
+    assert gap(self_regulated) < gap(msa_edge_state(G, od, iters=30, step_size="msa"))
+    assert sum(s["flow"] for s in self_regulated.values()) == pytest.approx(300.0)
+
+
+def test_accumulate_flows_sums_csr_paths():
+    offsets = np.array([0, 2, 2, 5])
+    edge_ids = np.array([0, 1, 1, 2, 3])
+    demands = np.array([10.0, 99.0, 5.0])
+
+    flows = accumulate_flows(offsets, edge_ids, demands, n_edges=5)
+
+    np.testing.assert_array_equal(flows, [10.0, 15.0, 5.0, 5.0, 0.0])
+
+
+@pytest.mark.parametrize("rel_gap_tol", [0.0, 0.05])
+def test_compiled_msa_loop_matches_python_loop(monkeypatch, rel_gap_tol):
+    pytest.importorskip("numba")
+    G = nx.MultiDiGraph()
+    G.add_edge("a", "b", t0=1.0, capacity=10.0)
+    G.add_edge("a", "b", t0=1.5, capacity=20.0)
+    G.add_edge("b", "c", t0=1.0, capacity=10.0)
+    G.add_edge("a", "c", t0=3.0, capacity=10.0)
+    G.add_edge("c", "a", t0=1.0, capacity=10.0)
+    od = [("a", "c", 30.0), ("c", "b", 5.0), ("b", "a", 1.0), ("a", "missing", 2.0)]
+
+    compiled = msa_edge_state(G, od, iters=10, excluded={("b", "c", 0)}, rel_gap_tol=rel_gap_tol)
+    monkeypatch.setattr(msa, "HAVE_NUMBA", False)
+    python = msa_edge_state(G, od, iters=10, excluded={("b", "c", 0)}, rel_gap_tol=rel_gap_tol)
+
+    assert compiled.keys() == python.keys()
+    for e, s in compiled.items():
+        assert s["flow"] == pytest.approx(python[e]["flow"])
+        assert s["time"] == pytest.approx(python[e]["time"])
+
+
+def test_with_overlay_matches_from_graph():
+    G = nx.MultiDiGraph()
+    G.add_edge("a", "b", t0=1.0, capacity=10.0, flow=2.0)
+    G.add_edge("a", "b", time=4.0)
+    G.add_edge("b", "c", t0=2.0, capacity=5.0)
+    overrides = {("a", "b", 1): {"capacity": 7.0, "t0": 3.0}, ("b", "c", 0): {"capacity": 6.0}}
+    excluded = {("a", "b", 0)}
+
+    expected = EdgeArrays.from_graph(G, overrides=overrides, excluded=excluded)
+    actual = build_or_get_soa(G).with_overlay(overrides=overrides, excluded=excluded)
+
+    assert actual.edges == expected.edges
+    for name in ("t0", "capacity", "flow", "time", "has_t0"):
+        np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name))
+    assert build_or_get_soa(G) is build_or_get_soa(G)
+
+
+def test_soa_artifact_round_trip(tmp_path):
+    G = nx.MultiDiGraph()
+    G.add_node(9)
+    G.add_edge(1, 2, t0=1.0, capacity=10.0, flow=2.0, geometry="dropped")
+    G.add_edge(1, 2, time=4.0)
+    G.add_edge(2, 1, t0=2.0, capacity=5.0)
+
+    save_soa(G, tmp_path / "graph.soa.npz")
+    arrays = load_soa(tmp_path / "graph.soa.npz")
+    H = load_soa(tmp_path / "graph.soa.npz", as_graph=True)
+
+    expected = EdgeArrays.from_graph(G)
+    assert arrays.edges == expected.edges
+    for name in ("t0", "capacity", "flow", "time", "has_t0"):
+        np.testing.assert_array_equal(getattr(arrays, name), getattr(expected, name))
+    assert list(H.nodes) == list(G.nodes)
+    assert H[1][2][0] == {"t0": 1.0, "capacity": 10.0, "flow": 2.0, "time": 1.0}
+    assert "t0" not in H[1][2][1]
+    assert build_or_get_soa(H).edges == expected.edges
+
+
+@pytest.mark.parametrize("compiled", [True, False])
+def test_float32_assignment_tracks_float64(monkeypatch, compiled):
+    if compiled:
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(msa, "HAVE_NUMBA", False)
+    G = nx.MultiDiGraph()
+    G.add_edge("a", "b", t0=10.0, capacity=100.0)
+    G.add_edge("a", "b", t0=12.0, capacity=100.0)
+    G.add_edge("b", "c", t0=5.0, capacity=150.0)
+    od = [("a", "b", 300.0), ("a", "c", 120.0)]
+
+    single = msa.msa_edge_arrays(G, od, iters=20, dtype=np.float32)
+    double = msa.msa_edge_arrays(G, od, iters=20)
+
+    assert single.flow.dtype == np.float32 and double.flow.dtype == np.float64
+    np.testing.assert_allclose(single.flow, double.flow, rtol=1e-4)
+    np.testing.assert_allclose(single.time, double.time, rtol=1e-4)
@@ -0,0 +1,21 @@
+import networkx as nx
+import numpy as np
+
+from sxm_mobility.demand.od_generation import random_od, random_od_arrays
+
+
+def test_random_od_is_reproducible_and_never_loops():
+    G = nx.path_graph(3, create_using=nx.MultiDiGraph)
+
+    od = random_od(G, n_pairs=500, min_demand=10.0, max_demand=20.0, seed=7)
+
+    assert od == random_od(G, n_pairs=500, min_demand=10.0, max_demand=20.0, seed=7)
+    assert all(o != d and o in G and d in G and 10.0 <= dem <= 20.0 for o, d, dem in od)
+
+    origins, dests, demands = random_od_arrays(
+        G, n_pairs=500, min_demand=10.0, max_demand=20.0, seed=7
+    )
+    assert origins.dtype == np.int32 and dests.dtype == np.int32
+    assert [
+        (int(o), int(d), float(x)) for o, d, x in zip(origins, dests, demands, strict=True)
+    ] == od
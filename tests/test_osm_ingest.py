@@ -0,0 +1,75 @@
+import pickle
+
+import networkx as nx
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from shapely.geometry import LineString
+
+from sxm_mobility.io.osm_ingest import (
+    _extent_metadata,
+    load_gpickle,
+    load_graph_arrow,
+    make_graph_graphml_safe,
+    read_edges_extent,
+    save_gpickle,
+    save_graph_arrow,
+)
+
+
+def test_graph_arrow_round_trip(tmp_path):
+    G = nx.MultiDiGraph(crs="epsg:4326")
+    G.add_node(1, x=-63.1, y=18.0)
+    G.add_node(2, x=-63.2, y=18.1)
+    G.add_edge(1, 2, length=10.0, highway="primary", geometry=LineString([(0, 0), (1, 1)]))
+    G.add_edge(1, 2, length=12.0, highway=["primary", "secondary"])
+    G.add_edge(2, 1, length=10.0)
+
+    save_graph_arrow(G, tmp_path / "graph")
+    H = load_graph_arrow(tmp_path / "graph")
+
+    assert H.graph == G.graph
+    assert list(H.nodes(data=True)) == list(G.nodes(data=True))
+    assert list(H.edges(keys=True, data=True)) == list(G.edges(keys=True, data=True))
+
+
+def test_load_gpickle_reads_gzip_and_plain_pickles(tmp_path):
+    G = nx.MultiDiGraph()
+    G.add_edge(1, 2, length=10.0)
+
+    save_gpickle(G, tmp_path / "graph.gpickle")
+    with (tmp_path / "legacy.gpickle").open("wb") as f:
+        pickle.dump(G, f)
+
+    for name in ("graph.gpickle", "legacy.gpickle"):
+        H = load_gpickle(tmp_path / name)
+        assert list(H.edges(keys=True, data=True)) == list(G.edges(keys=True, data=True))
+
+
+def test_read_edges_extent_round_trip(tmp_path):
+    table = pa.table({"u": [1]}).replace_schema_metadata(
+        _extent_metadata(np.array([-63.2, -63.0]), np.array([18.0, 18.1]))
+    )
+    pq.write_table(table, tmp_path / "edges.parquet")
+    pq.write_table(pa.table({"u": [1]}), tmp_path / "legacy.parquet")
+
+    extent = read_edges_extent(tmp_path / "edges.parquet")
+    assert extent["bbox"] == [-63.2, 18.0, -63.0, 18.1]
+    assert abs(extent["center_lon"] + 63.1) < 1e-9 and abs(extent["center_lat"] - 18.05) < 1e-9
+    assert read_edges_extent(tmp_path / "legacy.parquet") is None
+
+
+def test_make_graph_graphml_safe_leaves_input_untouched():
+    G = nx.MultiDiGraph(crs="epsg:4326", _cache=object())
+    G.add_node(1, x=-63.1, ref=None)
+    G.add_edge(1, 2, highway=["primary", "secondary"], geometry=LineString([(0, 0), (1, 1)]))
+
+    H = make_graph_graphml_safe(G)
+
+    assert H.graph == {"crs": "epsg:4326"}
+    assert H.nodes[1] == {"x": -63.1, "ref": ""}
+    assert H[1][2][0] == {
+        "highway": '["primary", "secondary"]',
+        "geometry": "LINESTRING (0 0, 1 1)",
+    }
+    assert G[1][2][0]["highway"] == ["primary", "secondary"]
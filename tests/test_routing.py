@@ -0,0 +1,41 @@
+import networkx as nx
+import pytest
+
+from sxm_mobility.assignment import routing
+from sxm_mobility.assignment.routing import RoutingIndex
+
+
+def _graph() -> nx.MultiDiGraph:
+    G = nx.MultiDiGraph()
+    G.add_edge("a", "b", time=1.0)
+    G.add_edge("a", "b", time=0.5)
+    G.add_edge("b", "c", time=1.0)
+    G.add_edge("a", "c", time=5.0)
+    G.add_edge("c", "d", time=1.0)
+    return G
+
+
+@pytest.mark.parametrize(
+    "backend", ["IGraphRoutingIndex", "ScipyRoutingIndex", "CuGraphRoutingIndex"]
+)
+@pytest.mark.parametrize("closed", [frozenset(), {("b", "c", 0)}, {("c", "d", 0)}])
+def test_backend_index_matches_pure_python(backend, closed, monkeypatch):
+    pytest.importorskip(
+        {
+            "IGraphRoutingIndex": "igraph",
+            "ScipyRoutingIndex": "scipy",
+            "CuGraphRoutingIndex": "cugraph",
+        }[backend]
+    )
+    index_cls = getattr(routing, backend)
+    monkeypatch.setattr(routing.CuGraphRoutingIndex, "min_gpu_origins", 0)
+
+    G = _graph()
+    state = {
+        (u, v, k): d for u, v, k, d in G.edges(keys=True, data=True) if (u, v, k) not in closed
+    }
+    od = [("a", "c", 1.0), ("a", "d", 2.0), ("d", "a", 3.0), ("a", "a", 4.0)]
+
+    expected = list(RoutingIndex(G).route(od, state))
+    assert list(index_cls(G).route(od, state)) == expected
+    assert expected[0] == (1.0, [("a", "b", 1), ("b", "c", 0)]) or closed
@@ -0,0 +1,149 @@
+from dataclasses import asdict
+
+import networkx as nx
+import pytest
+
+from sxm_mobility.assignment.msa import msa_traffic_assignment
+from sxm_mobility.assignment.soa import build_or_get_soa
+from sxm_mobility.scenarios.catalog import AddConnector, Closure, EdgeOverlay, IncreaseCapacity
+from sxm_mobility.scenarios.evaluator import score_graph
+from sxm_mobility.scenarios.runner import run_scenario, run_scenarios
+
+
+def _graph() -> nx.MultiDiGraph:
+    G = nx.MultiDiGraph()
+    G.add_edge("a", "b", t0=1.0, capacity=10.0)
+    G.add_edge("a", "b", t0=1.5, capacity=20.0)
+    G.add_edge("b", "c", t0=1.0, capacity=10.0)
+    G.add_edge("a", "c", t0=4.0, capacity=10.0)
+    G.add_edge("c", "a", t0=1.0, capacity=10.0)
+    return G
+
+
+def _snapshot(G: nx.MultiDiGraph) -> list:
+    return [(u, v, k, dict(d)) for u, v, k, d in G.edges(keys=True, data=True)] + [
+        list(G.pred[n]) for n in G
+    ]
+
+
+def test_applied_overlay_is_undone_exactly():
+    G = _graph()
+    before = _snapshot(G)
+    base_arrays = build_or_get_soa(G)
+    overlay = EdgeOverlay(
+        overrides={("a", "b", 1): {"capacity": 5.0}},
+        excluded=frozenset({("b", "c", 0)}),
+        added=(("c", "d", {"t0": 1.0}), ("a", "b", {"t0": 2.0})),
+    )
+
+    with overlay.applied(G) as H:
+        assert H is G
+        assert G.has_edge("c", "d") and G.has_edge("a", "b", 2)
+        # overrides and closures stay an overlay on the arrays
+        assert G["a"]["b"][1]["capacity"] == 20.0 and G.has_edge("b", "c", 0)
+        assert len(build_or_get_soa(G).edges) == len(base_arrays.edges) + 2
+
+    assert _snapshot(G) == before
+    assert "d" not in G
+    assert build_or_get_soa(G) is base_arrays
+
+
+def test_add_connector_runs_in_place_and_matches_copy():
+    G = _graph()
+    before = _snapshot(G)
+    od = [("a", "c", 30.0), ("b", "a", 5.0)]
+    scenario = AddConnector(name="link", description="", u="b", v="a", length_m=100.0)
+
+    result = run_scenario(G, od=od, scenario=scenario, iters=10, alpha=0.15, beta=4.0)
+
+    expected = score_graph(msa_traffic_assignment(scenario.apply(G), od=od, iters=10))
+    assert result["scores"] == pytest.approx(expected)
+    assert _snapshot(G) == before
+
+
+@pytest.mark.parametrize(
+    "scenario",
+    [
+        IncreaseCapacity(name="widen", description="", u="b", v="c", key=0, pct=0.5),
+        Closure(name="close", description="", u="a", v="b", key=0),
+    ],
+)
+def test_overlay_scenarios_leave_the_base_graph_unchanged(scenario):
+    G = _graph()
+    before = _snapshot(G)
+    od = [("a", "c", 30.0), ("c", "b", 5.0)]
+
+    result = run_scenario(G, od=od, scenario=scenario, iters=10, alpha=0.15, beta=4.0)
+
+    expected = score_graph(msa_traffic_assignment(scenario.apply(G), od=od, iters=10))
+    assert result["scores"] == pytest.approx(expected)
+    assert _snapshot(G) == before
+
+
+def test_run_scenarios_matches_sequential_runs():
+    G = _graph()
+    od = [("a", "c", 30.0), ("b", "a", 5.0)]
+    scenarios = [
+        AddConnector(name="link", description="", u="b", v="a", length_m=100.0),
+        Closure(name="close", description="", u="a", v="c", key=0),
+        IncreaseCapacity(name="widen", description="", u="b", v="c", key=0, pct=0.5),
+    ]
+    kwargs = dict(od=od, iters=10, alpha=0.15, beta=4.0)
+
+    expected = [run_scenario(G, scenario=s, **kwargs) for s in scenarios]
+    for n_workers in (1, 2):
+        results = run_scenarios(G, scenarios=scenarios, n_workers=n_workers, **kwargs)
+        assert [r["scenario"] for r in results] == [r["scenario"] for r in expected]
+        for r, e in zip(results, expected, strict=True):
+            assert r["scores"] == pytest.approx(e["scores"])
+
+
+@pytest.mark.parametrize(
+    "scenario",
+    [
+        IncreaseCapacity(name="widen", description="", u="b", v="c", key=0, pct=0.5),
+        Closure(name="close", description="", u="a", v="b", key=0),
+        AddConnector(name="link", description="", u="c", v="d", length_m=100.0),
+        Closure(name="missing", description="", u="a", v="b", key=7),
+    ],
+)
+def test_apply_inplace_matches_apply_and_restores(scenario):
+    G = _graph()
+    before = sorted(map(repr, _snapshot(G)))
+    base_arrays = build_or_get_soa(G)
+    expected = scenario.apply(G)
+
+    token = scenario.apply_inplace(G)
+    assert sorted(G.edges(keys=True, data=True)) == sorted(expected.edges(keys=True, data=True))
+    scenario.restore(G, token)
+
+    # a reopened closure goes back at the end of its adjacency
+    assert sorted(map(repr, _snapshot(G))) == before
+    assert build_or_get_soa(G) is base_arrays
+
+
+def test_as_dict_matches_asdict_and_returns_a_copy():
+    scenario = AddConnector(name="link", description="", u="b", v="a", length_m=100.0)
+
+    first = scenario.as_dict()
+    first["name"] = "changed"
+
+    assert scenario.as_dict() == asdict(scenario)
+
+
+@pytest.mark.parametrize(
+    "scenario",
+    [
+        IncreaseCapacity(name="widen", description="", u="b", v="c", key=0, pct=0.5),
+        Closure(name="close", description="", u="a", v="b", key=0),
+        AddConnector(name="link", description="", u="c", v="d", length_m=100.0),
+    ],
+)
+def test_apply_mutate_changes_the_graph_itself(scenario):
+    G = _graph()
+    expected = sorted(scenario.apply(G).edges(keys=True, data=True))
+    base_arrays = build_or_get_soa(G)
+
+    assert scenario.apply(G, mutate=True) is G
+    assert sorted(G.edges(keys=True, data=True)) == expected
+    assert build_or_get_soa(G) is not base_arrays
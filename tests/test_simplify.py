@@ -0,0 +1,24 @@
+import networkx as nx
+
+from sxm_mobility.network.simplify import largest_weakly_connected_component
+
+
+def test_largest_weakly_connected_component_matches_subgraph_copy():
+    G = nx.MultiDiGraph(crs="epsg:4326")
+    G.add_edge("x", "y", length=1.0)
+    G.add_edge(1, 2, length=2.0)
+    G.add_edge(3, 2, length=3.0)
+    G.add_edge(1, 2, length=4.0)
+    G.add_node("lonely")
+    G.add_edge("p", "q")
+    G.add_edge("q", "r")
+
+    H = largest_weakly_connected_component(G)
+    expected = G.subgraph([1, 2, 3]).copy()
+
+    # the first of the two 3-node components wins, as with `max`
+    assert list(H.nodes) == list(expected.nodes) == [1, 2, 3]
+    assert list(H.edges(keys=True, data=True)) == list(expected.edges(keys=True, data=True))
+    assert H.graph == G.graph
+    H[1][2][0]["length"] = 9.0
+    assert G[1][2][0]["length"] == 2.0